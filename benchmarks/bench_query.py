@@ -0,0 +1,120 @@
+"""
+Benchmark: per-record cost of repeated searches, original loop vs. compiled Query.
+
+Columns: the original search_sweets loop; composed closures (one function
+per active check, the alternative to generated code); search_sweets(),
+which builds a Query per call; and one Query reused across calls.
+
+Run from the repository root:
+    python benchmarks/bench_query.py [--sweets N] [--repeat N] [--seed N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sweetshop.inventory import Inventory
+from sweetshop.query import Query
+from sweetshop.workload import generate_catalog
+
+HOT_QUERIES = [
+    {"name": "kaju"},
+    {"category": "Milk-Based"},
+    {"min_price": 10.0, "max_price": 30.0},
+    {"name": "ba", "category": "Nut-Based", "min_price": 15.0},
+    {"name": "jamun", "max_price": 40.0},
+]
+
+
+def loop_search(sweets, name=None, category=None, min_price=None, max_price=None):
+    """The search_sweets loop before queries were compiled, kept as the baseline"""
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise ValueError("min_price cannot be greater than max_price")
+
+    results = []
+    for sweet in sweets:
+        name_match = True
+        if name is not None:
+            name_match = name.lower() in sweet.name.lower()
+
+        category_match = True
+        if category is not None:
+            category_match = category == sweet.category
+
+        price_match = True
+        if min_price is not None:
+            price_match = sweet.price >= min_price
+        if max_price is not None:
+            price_match = price_match and (sweet.price <= max_price)
+
+        if name_match and category_match and price_match:
+            results.append(sweet)
+    return results
+
+
+def closure_query(name=None, category=None, min_price=None, max_price=None):
+    """Compose one closure per active check, cheapest first, into a select function"""
+    checks = []
+    if category is not None:
+        checks.append(lambda s: s.category == category)
+    if min_price is not None and max_price is not None:
+        checks.append(lambda s: min_price <= s.price <= max_price)
+    elif min_price is not None:
+        checks.append(lambda s: s.price >= min_price)
+    elif max_price is not None:
+        checks.append(lambda s: s.price <= max_price)
+    if name:
+        needle = name.lower()
+        checks.append(lambda s: needle in s.name.lower())
+
+    predicate = checks[0]
+    for check in checks[1:]:
+        predicate = (lambda first, second: lambda s: first(s) and second(s))(predicate, check)
+    return lambda sweets: list(filter(predicate, sweets))
+
+
+def measure(fn, repeat):
+    """Return the best-of-3 time for calling fn repeat times"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sweets", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    inventory = Inventory()
+    for sweet in generate_catalog(args.sweets, seed=args.seed):
+        inventory.add_sweet(sweet)
+    records = args.sweets * args.repeat
+
+    print(f"{args.sweets:,} sweets, each query run {args.repeat} times (ns per record)\n")
+    print(f"{'Query':<62} {'Loop':>7} {'Closure':>8} {'search':>7} {'Query':>7} {'Speed-up':>9}")
+    for filters in HOT_QUERIES:
+        query = Query(**filters)
+        closures = closure_query(**filters)
+        assert query.run(inventory) == loop_search(inventory.sweets, **filters) == closures(inventory.sweets)
+
+        loop = measure(lambda: loop_search(inventory.sweets, **filters), args.repeat)
+        composed = measure(lambda: closures(inventory.sweets), args.repeat)
+        search = measure(lambda: inventory.search_sweets(**filters), args.repeat)
+        prepared = measure(lambda: query.run(inventory), args.repeat)
+        print(f"{repr(query):<62} {loop / records * 1e9:>7.1f} {composed / records * 1e9:>8.1f} "
+              f"{search / records * 1e9:>7.1f} {prepared / records * 1e9:>7.1f} {loop / prepared:>8.2f}x")
+
+    build = measure(lambda: Query(name="kaju", max_price=40.0), 100_000) / 100_000
+    print(f"\nBuilding a Query (compiled predicate cached per filter combination): {build * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
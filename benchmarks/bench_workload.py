@@ -0,0 +1,39 @@
+"""
+Benchmark: replay a synthetic shop workload against Inventory.
+
+Run from the repository root:
+    python benchmarks/bench_workload.py [--sweets N] [--ops N] [--skew S] [--threads N] [--seed N]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sweetshop.inventory import Inventory
+from sweetshop.workload import generate_catalog, generate_operations, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sweets", type=int, default=5_000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    catalog_seed, ops_seed = args.seed, args.seed + 1
+    operations = generate_operations(generate_catalog(args.sweets, seed=catalog_seed), args.ops,
+                                     skew=args.skew, seed=ops_seed)
+
+    for threads in args.threads:
+        inventory = Inventory()
+        for sweet in generate_catalog(args.sweets, seed=catalog_seed):
+            inventory.add_sweet(sweet)
+        print(replay(inventory, operations, threads=threads).format())
+        print()
+
+
+if __name__ == "__main__":
+    main()
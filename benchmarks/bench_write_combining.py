@@ -0,0 +1,109 @@
+"""
+Benchmark: direct purchase/restock calls vs. WriteCombiner on a Zipf-skewed workload.
+
+The mixed stream is also split into its hot-key part (the 10 hottest
+sweets) and cold-key part and each is measured on its own, since
+combining only merges requests for sweets that are pending together.
+
+Run from the repository root:
+    python benchmarks/bench_write_combining.py [--ops N] [--sweets N] [--skew S]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sweetshop.combining import WriteCombiner
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+from sweetshop.workload import ZipfSampler
+
+
+def build_inventory(sweet_count):
+    """Create an inventory with plenty of stock for every sweet"""
+    inventory = Inventory()
+    for sweet_id in range(1, sweet_count + 1):
+        inventory.add_sweet(Sweet(id=sweet_id, name=f"Sweet {sweet_id}", category="Candy",
+                                  price=1.0, quantity=10 ** 9))
+    return inventory
+
+
+def zipf_operations(op_count, sweet_count, skew, seed=42):
+    """Generate (sweet_id, delta) pairs: 90% purchases, 10% restocks"""
+    rng = random.Random(seed)
+    popularity = ZipfSampler(sweet_count, skew, rng)
+    operations = []
+    for _ in range(op_count):
+        sweet_id = popularity.sample() + 1
+        delta = rng.randint(1, 5)
+        operations.append((sweet_id, -delta if rng.random() < 0.9 else delta))
+    return operations
+
+
+def run_direct(inventory, operations):
+    """Apply each operation with its own inventory call"""
+    for sweet_id, delta in operations:
+        if delta < 0:
+            inventory.purchase_sweet(sweet_id, -delta)
+        else:
+            inventory.restock_sweet(sweet_id, delta)
+
+
+def run_combined(inventory, operations, batch_size):
+    """Apply operations through a WriteCombiner and collect every outcome"""
+    requests = []
+    with WriteCombiner(inventory, batch_size=batch_size) as combiner:
+        for sweet_id, delta in operations:
+            if delta < 0:
+                requests.append(combiner.purchase_sweet(sweet_id, -delta))
+            else:
+                requests.append(combiner.restock_sweet(sweet_id, delta))
+    for request in requests:
+        request.result()
+
+
+def measure(label, fn, op_count):
+    """Time one run and print its throughput"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<26} {elapsed:8.3f}s  {op_count / elapsed:12,.0f} ops/s")
+    return elapsed
+
+
+def compare(title, operations, sweet_count):
+    """Measure direct calls and each batch size on one operation stream"""
+    print(f"{title}: {len(operations):,} ops")
+    inventory = build_inventory(sweet_count)
+    baseline = measure("direct calls", lambda: run_direct(inventory, operations), len(operations))
+    for batch_size in (64, 1024, 8192):
+        inventory = build_inventory(sweet_count)
+        elapsed = measure(f"combined (batch={batch_size})",
+                          lambda: run_combined(inventory, operations, batch_size), len(operations))
+        print(f"  {'':<26} speed-up x{baseline / elapsed:.2f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--sweets", type=int, default=10_000)
+    parser.add_argument("--skew", type=float, default=1.2)
+    args = parser.parse_args()
+
+    operations = zipf_operations(args.ops, args.sweets, args.skew)
+    hot = [op for op in operations if op[0] <= 10]
+    cold = [op for op in operations if op[0] > 10]
+    print(f"{args.ops:,} ops over {args.sweets:,} sweets, Zipf s={args.skew} "
+          f"({len(hot) / args.ops:.0%} of traffic on the 10 hottest sweets)\n")
+
+    compare("Mixed Zipf stream", operations, args.sweets)
+    compare("Hot keys only (10 hottest sweets)", hot, args.sweets)
+    compare("Cold keys only (all other sweets)", cold, args.sweets)
+
+
+if __name__ == "__main__":
+    main()
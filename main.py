@@ -1,3 +1,4 @@
+from sweetshop.export import export_sweets
 from sweetshop.inventory import Inventory
 from sweetshop.models import Sweet
 
@@ -13,6 +14,7 @@ def display_menu():
     print("5. 🔄 Sort Sweets")
     print("6. 🛒 Purchase Sweet")
     print("7. 📦 Restock Sweet")
+    print("8. 📤 Export Sweets")
     print("0. 🚪 Exit")
 
 def get_integer_input(prompt, min_val=None, max_val=None):
@@ -103,6 +105,10 @@ def search_sweets_cli(inventory):
     print("Leave any field blank to skip that filter")
     
     name = input("Enter name (or partial name) to search: ").strip() or None
+    if name:
+        suggestions = inventory.autocomplete(name)
+        if suggestions:
+            print("💡 Popular matches: " + ", ".join(sweet.name for sweet in suggestions))
     category = input("Enter category to search: ").strip() or None
     
     min_price = None
@@ -206,6 +212,33 @@ def restock_sweet_cli(inventory):
     except ValueError as e:
         print(f"❌ Error: {e}")
 
+def export_sweets_cli(inventory):
+    """Handle exporting sweets to a file via CLI"""
+    print("\n📤 Export Sweets")
+    print("Use .csv or .jsonl, optionally followed by .gz to compress")
+    path = get_string_input("Enter output file path: ")
+    fmt = "jsonl" if path.endswith((".jsonl", ".jsonl.gz")) else "csv"
+    compress = path.endswith(".gz")
+    
+    print("Leave any field blank to export every sweet")
+    name = input("Enter name (or partial name) to export: ").strip() or None
+    category = input("Enter category to export: ").strip() or None
+    try:
+        min_price_input = input("Enter minimum price (leave blank for none): ").strip()
+        min_price = float(min_price_input) if min_price_input else None
+        max_price_input = input("Enter maximum price (leave blank for none): ").strip()
+        max_price = float(max_price_input) if max_price_input else None
+    except ValueError:
+        print("⚠️ Invalid price input. Using no price filters.")
+        min_price = max_price = None
+    
+    try:
+        written = export_sweets(inventory, path, fmt, compress=compress, name=name,
+                                category=category, min_price=min_price, max_price=max_price)
+        print(f"✅ Exported {written} sweet(s) to {path} as {fmt.upper()}")
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+
 def main():
     """Main entry point for the Sweet Shop CLI"""
     inventory = Inventory()
@@ -213,7 +246,7 @@ def main():
     while True:
         display_menu()
         try:
-            choice = get_integer_input("\nEnter your choice (0-7): ", min_val=0, max_val=7)
+            choice = get_integer_input("\nEnter your choice (0-8): ", min_val=0, max_val=8)
             
             if choice == 0:
                 print("\n🚪 Exiting Sweet Shop Management System. Goodbye! 👋")
@@ -232,6 +265,8 @@ def main():
                 purchase_sweet_cli(inventory)
             elif choice == 7:
                 restock_sweet_cli(inventory)
+            elif choice == 8:
+                export_sweets_cli(inventory)
             else:
                 print("⚠️ Invalid choice. Please try again.")
         
@@ -0,0 +1,189 @@
+from typing import List
+
+ADDED = "added"
+DELETED = "deleted"
+QUANTITY_CHANGED = "quantity_changed"
+PRICE_CHANGED = "price_changed"
+
+
+class ResyncRequired(LookupError):
+    """Raised when a consumer asks for events that have left the change feed"""
+
+
+class ChangeEvent:
+    """Represents one mutation of the inventory"""
+
+    __slots__ = ("seq", "kind", "sweet_id", "old", "new")
+
+    def __init__(self, seq: int, kind: str, sweet_id: int, old=None, new=None):
+        """
+        Initialize a ChangeEvent instance.
+
+        Args:
+            seq: Sequence number, increasing by one per event
+            kind: One of ADDED, DELETED, QUANTITY_CHANGED or PRICE_CHANGED
+            sweet_id: ID of the sweet that changed
+            old: Previous value (SweetRecord for DELETED, number otherwise)
+            new: New value (SweetRecord for ADDED, number otherwise)
+        """
+        self.seq = seq
+        self.kind = kind
+        self.sweet_id = sweet_id
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return (f"ChangeEvent(seq={self.seq}, kind={self.kind!r}, "
+                f"sweet_id={self.sweet_id}, old={self.old!r}, new={self.new!r})")
+
+
+class ChangeFeed:
+    """
+    Bounded change-data-capture log of inventory mutations.
+
+    Events are kept in a fixed-size ring buffer, so memory stays constant and
+    reading from any retained sequence number is O(1) to locate. Once an event
+    has been overwritten, consumers asking for it get ResyncRequired and must
+    rebuild from a fresh snapshot.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize an empty feed.
+
+        Args:
+            capacity: Maximum number of events retained
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+
+        self.capacity = capacity
+        self._ring = [None] * capacity
+        self._last_seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent event (0 if none yet)"""
+        return self._last_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        """Sequence number of the oldest event still retained"""
+        return max(1, self._last_seq - self.capacity + 1)
+
+    def publish(self, kind: str, sweet_id: int, old=None, new=None) -> ChangeEvent:
+        """
+        Append an event to the feed, overwriting the oldest when full.
+
+        Returns:
+            The published ChangeEvent
+        """
+        seq = self._last_seq + 1
+        event = ChangeEvent(seq, kind, sweet_id, old, new)
+        # Fill the slot before advancing last_seq, so a reader never sees a
+        # sequence number whose event is not in the ring yet
+        self._ring[seq % self.capacity] = event
+        self._last_seq = seq
+        return event
+
+    def read(self, after_seq: int, limit: int = None) -> List[ChangeEvent]:
+        """
+        Return events with a sequence number greater than after_seq.
+
+        Args:
+            after_seq: Last sequence number the caller has already seen
+            limit: Maximum number of events to return (None for all)
+
+        Returns:
+            List of ChangeEvent objects in sequence order
+
+        Raises:
+            ResyncRequired: If events after after_seq have been overwritten,
+                            or after_seq is beyond the end of the feed
+        """
+        self._check_position(after_seq)
+
+        end = self._last_seq
+        if limit is not None:
+            end = min(end, after_seq + limit)
+
+        ring = self._ring
+        capacity = self.capacity
+        seqs = range(after_seq + 1, end + 1)
+        events = [ring[seq % capacity] for seq in seqs]
+
+        # Reads take no lock, so a concurrent publish may have overwritten
+        # slots while they were copied; any gap means events were lost
+        if not all(event.seq == seq for event, seq in zip(events, seqs)):
+            raise ResyncRequired(
+                f"Events after seq {after_seq} were overwritten while being read; "
+                f"resync from a snapshot.")
+        return events
+
+    def subscribe(self, after_seq: int = None) -> "Subscription":
+        """
+        Start consuming the feed.
+
+        Args:
+            after_seq: Last sequence number already applied by the consumer.
+                       Defaults to the current end of the feed.
+
+        Returns:
+            A Subscription positioned after after_seq
+
+        Raises:
+            ResyncRequired: If events after after_seq have been overwritten,
+                            or after_seq is beyond the end of the feed
+        """
+        if after_seq is None:
+            after_seq = self._last_seq
+        else:
+            self._check_position(after_seq)
+        return Subscription(self, after_seq)
+
+    def _check_position(self, after_seq: int):
+        """Helper method to reject positions outside the retained events"""
+        if after_seq > self._last_seq:
+            raise ResyncRequired(
+                f"Seq {after_seq} is beyond the end of the feed ({self._last_seq}); "
+                f"resync from a snapshot.")
+        if after_seq + 1 < self.oldest_seq:
+            raise ResyncRequired(
+                f"Events after seq {after_seq} are no longer retained; "
+                f"resync from a snapshot.")
+
+
+class Subscription:
+    """Cursor over a ChangeFeed that remembers the last event consumed"""
+
+    def __init__(self, feed: ChangeFeed, position: int):
+        """
+        Initialize a Subscription.
+
+        Args:
+            feed: Feed to read from
+            position: Sequence number of the last event already consumed
+        """
+        self.feed = feed
+        self.position = position
+
+    @property
+    def lag(self) -> int:
+        """Number of published events not yet consumed"""
+        return self.feed.last_seq - self.position
+
+    def poll(self, limit: int = None) -> List[ChangeEvent]:
+        """
+        Return the next batch of events and advance past them.
+
+        Raises:
+            ResyncRequired: If the consumer fell further behind than the
+                            feed's capacity
+        """
+        events = self.feed.read(self.position, limit)
+        if events:
+            self.position = events[-1].seq
+        return events
@@ -0,0 +1,114 @@
+import csv
+import gzip
+import io
+import sys
+from itertools import islice
+from json.encoder import encode_basestring_ascii
+from typing import Iterable
+from sweetshop import filters
+
+FORMATS = ("csv", "jsonl")
+FIELDS = ("id", "name", "category", "price", "quantity")
+
+# Rows formatted per write, and bytes buffered between the writer and disk
+DEFAULT_CHUNK_ROWS = 8192
+_BUFFER_SIZE = 1 << 20
+# zlib's default level; 9 costs far more CPU for a few percent smaller files
+_GZIP_LEVEL = 6
+
+
+def export_sweets(source, destination, fmt: str = "csv", compress: bool = False,
+                  name=None, category=None, min_price=None, max_price=None,
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """
+    Stream sweets that match a search to CSV or JSON Lines.
+
+    An Inventory is read through snapshot(), so the export is consistent as
+    of a single change-feed sequence number while writers carry on. Sweets
+    are filtered lazily and formatted ``chunk_rows`` at a time into one
+    large write each, so memory use stays bounded however big the
+    inventory is.
+
+    Args:
+        source: Inventory, InventorySnapshot, or any iterable of sweets
+        destination: File path, "-" for standard output, or a binary file
+        fmt: "csv" (with a header row) or "jsonl" (one object per line)
+        compress: If True, gzip the output
+        name: Case-insensitive substring to search in sweet names
+        category: Exact category to match
+        min_price: Minimum price (inclusive)
+        max_price: Maximum price (inclusive)
+        chunk_rows: Rows formatted per write
+
+    Returns:
+        Number of sweets written
+
+    Raises:
+        ValueError: If fmt is unknown, chunk_rows is not positive,
+                    or min_price > max_price
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if chunk_rows <= 0:
+        raise ValueError("Chunk size must be positive.")
+
+    if hasattr(source, "snapshot"):
+        source = source.snapshot()
+    rows = filters.iter_sweets(source, name, category, min_price, max_price)
+    format_chunk = _csv_chunk if fmt == "csv" else _jsonl_chunk
+
+    out, owned = _open(destination, compress)
+    try:
+        if fmt == "csv":
+            out.write(_csv_chunk([FIELDS]))
+        written = 0
+        while True:
+            chunk = [_fields(sweet) for sweet in islice(rows, chunk_rows)]
+            if not chunk:
+                break
+            out.write(format_chunk(chunk))
+            written += len(chunk)
+    finally:
+        if owned:
+            out.close()
+        else:
+            out.flush()
+    return written
+
+
+def _open(destination, compress: bool):
+    """Return (binary stream, whether export_sweets() must close it)"""
+    if isinstance(destination, str) and destination != "-":
+        if compress:
+            return gzip.open(destination, "wb", compresslevel=_GZIP_LEVEL), True
+        return open(destination, "wb", buffering=_BUFFER_SIZE), True
+
+    stream = sys.stdout.buffer if destination == "-" else destination
+    if compress:
+        # Closing the gzip wrapper writes the trailer but leaves stream open
+        return gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=_GZIP_LEVEL), True
+    return stream, False
+
+
+def _fields(sweet) -> tuple:
+    """Return a sweet's fields in FIELDS order"""
+    return (sweet.id, sweet.name, sweet.category, sweet.price, sweet.quantity)
+
+
+def _csv_chunk(rows: Iterable[tuple]) -> bytes:
+    """Format rows as CSV"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _jsonl_chunk(rows: Iterable[tuple]) -> bytes:
+    """Format rows as JSON Lines"""
+    # Only the strings need json's escaping; IDs, prices and quantities are
+    # plain ints and floats whose str() already is valid JSON
+    quote = encode_basestring_ascii
+    return "".join(
+        f'{{"id": {sweet_id}, "name": {quote(name)}, "category": {quote(category)}, '
+        f'"price": {price}, "quantity": {quantity}}}\n'
+        for sweet_id, name, category, price, quantity in rows
+    ).encode("utf-8")
@@ -0,0 +1,63 @@
+from typing import Iterable, Iterator, List
+from sweetshop.query import Query
+
+SORT_KEYS = {"name", "category", "price"}
+
+
+def search_sweets(sweets: Iterable, name=None, category=None, min_price=None, max_price=None) -> List:
+    """
+    Filter an iterable of sweets (or sweet records) by multiple criteria.
+
+    Args:
+        sweets: Sweet-like objects to filter
+        name: Case-insensitive substring to search in sweet names
+        category: Exact category to match
+        min_price: Minimum price (inclusive)
+        max_price: Maximum price (inclusive)
+
+    Returns:
+        List of items matching all specified filters
+
+    Raises:
+        ValueError: If min_price > max_price
+    """
+    return Query(name, category, min_price, max_price).select(sweets)
+
+
+def iter_sweets(sweets: Iterable, name=None, category=None, min_price=None, max_price=None) -> Iterator:
+    """
+    Lazily filter sweets; same filters as search_sweets().
+
+    The filters are validated immediately, but items are only read from
+    sweets as the result is consumed, so memory use does not grow with the
+    size of the input.
+
+    Raises:
+        ValueError: If min_price > max_price
+    """
+    return Query(name, category, min_price, max_price).iter(sweets)
+
+
+def sort_sweets(sweets: Iterable, key: str, reverse: bool = False) -> List:
+    """
+    Return a new list of sweets (or sweet records) sorted by an attribute.
+
+    Args:
+        sweets: Sweet-like objects to sort
+        key: Attribute to sort by ("name", "category", or "price")
+        reverse: If True, sort in descending order
+
+    Returns:
+        New list in sorted order
+
+    Raises:
+        ValueError: If key is not one of the supported sort keys
+    """
+    if key not in SORT_KEYS:
+        raise ValueError("Invalid sort key")
+
+    return sorted(
+        sweets,
+        key=lambda sweet: getattr(sweet, key),
+        reverse=reverse
+    )
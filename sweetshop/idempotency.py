@@ -0,0 +1,107 @@
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+
+class Outcome(NamedTuple):
+    """Stored result of one keyed call"""
+
+    fingerprint: tuple
+    result: Any
+    error: Optional[BaseException]
+    expires_at: float
+
+    def replay(self):
+        """Return the stored result, or raise the stored error again"""
+        if self.error is not None:
+            # Raise a copy, so the stored error never picks up a traceback
+            raise _detached(self.error)
+        return self.result
+
+
+class IdempotencyCache:
+    """
+    Bounded map from idempotency key to the outcome of the first call.
+
+    Keys live for ``ttl`` seconds after the call that stored them and at
+    most ``capacity`` are kept; when full, the least recently used key is
+    dropped. Entries sit in an OrderedDict in least-recently-used order, so
+    lookups, inserts and evictions are all O(1) and memory is capped by
+    capacity however many keys arrive.
+    """
+
+    def __init__(self, capacity: int = 100_000, ttl: float = 3600, clock=None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            capacity: Maximum number of keys kept
+            ttl: Seconds an outcome can be replayed for
+            clock: Zero-argument callable returning the current time
+
+        Raises:
+            ValueError: If capacity or ttl is not positive
+        """
+        if capacity <= 0 or ttl <= 0:
+            raise ValueError("Capacity and TTL must be positive.")
+
+        self.capacity = capacity
+        self.ttl = ttl
+        self._clock = clock or time.time
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key) -> Optional[Outcome]:
+        """Return the live outcome stored for key, or None"""
+        outcome = self._entries.get(key)
+        if outcome is None:
+            return None
+        if outcome.expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return outcome
+
+    def put(self, key, fingerprint: tuple, result=None, error: BaseException = None) -> Outcome:
+        """
+        Store the outcome of a call under key.
+
+        Args:
+            key: Idempotency key supplied by the caller
+            fingerprint: Identifies the call, so a reused key can be detected
+            result: Value the call returned
+            error: Exception the call raised, if any; a copy without the
+                   traceback is kept, so the call's frames and arguments
+                   are not held in memory
+
+        Returns:
+            The stored Outcome
+        """
+        if error is not None:
+            error = _detached(error)
+        now = self._clock()
+        outcome = Outcome(fingerprint, result, error, now + self.ttl)
+        self._entries[key] = outcome
+        self._entries.move_to_end(key)
+
+        # The front holds the least recently used keys: drop them while the
+        # cache is over capacity or they have expired anyway
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries.values()))
+            if len(entries) <= self.capacity and oldest.expires_at > now:
+                break
+            entries.popitem(last=False)
+        return outcome
+
+
+def _detached(error: BaseException) -> BaseException:
+    """Return a copy of error without its traceback, cause or context"""
+    try:
+        return copy.copy(error)
+    except Exception:
+        # Exceptions whose constructor does not accept their own args
+        return error.with_traceback(None)
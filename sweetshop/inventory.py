@@ -1,13 +1,148 @@
-from sweetshop.models import Sweet
-from typing import List
+import bisect
+import functools
+import inspect
+import itertools
+import threading
+import time
+import weakref
+from sweetshop import changefeed, filters, ledger, merkle
+from sweetshop.changefeed import ChangeFeed
+from sweetshop.idempotency import IdempotencyCache
+from sweetshop.ledger import SalesLedger
+from sweetshop.locations import DEFAULT_LOCATION, StockTable
+from sweetshop.merkle import MerkleIndex
+from sweetshop.models import Sweet, SweetRecord
+from sweetshop.query import Query
+from sweetshop.reservations import Reservation, TimingWheel
+from sweetshop.snapshot import InventorySnapshot
+from sweetshop.trie import AutocompleteTrie
+from typing import Dict, List, Optional
+
+# Versions kept for snapshots before the history is first checked for
+# entries no live snapshot can read; the limit then doubles with what is kept
+_HISTORY_PRUNE_MIN = 1024
+
+def _synchronized(method):
+    """Run an Inventory method while holding the inventory's write lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _freeze(value):
+    """Return an immutable stand-in for a call argument, for idempotency fingerprints"""
+    # A Sweet is fingerprinted by its ID, as Sweet.__eq__ compares it: the
+    # inventory keeps and mutates the object it was given, so a retry
+    # passing the same object would otherwise no longer match. Dicts and
+    # lists are copied so the cache holds no caller-owned mutable objects.
+    if isinstance(value, Sweet):
+        return (Sweet, value.id)
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(item) for item in value))
+    return value
+
+def _idempotent(method):
+    """
+    Accept an optional idempotency_key keyword on a mutating Inventory method.
+
+    The first call with a key runs normally and its outcome (return value or
+    raised exception) is cached; a retry with the same key replays that
+    outcome instead of applying the change again. Reusing a key for a call
+    with different arguments raises ValueError. Apply beneath @_synchronized
+    so the lookup, the call and the store happen under one lock.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, idempotency_key=None, **kwargs):
+        if idempotency_key is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        fingerprint = (method.__name__,) + tuple(
+            _freeze(value) for value in list(bound.arguments.values())[1:]
+        )
+
+        outcome = self._idempotency.get(idempotency_key)
+        if outcome is None:
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                self._idempotency.put(idempotency_key, fingerprint, error=e)
+                raise
+            self._idempotency.put(idempotency_key, fingerprint, result)
+            return result
+
+        if outcome.fingerprint != fingerprint:
+            raise ValueError("Idempotency key was already used for a different call.")
+        return outcome.replay()
+    return wrapper
 
 class Inventory:
     """Manages inventory of sweets in the sweet shop"""
     
-    def __init__(self):
-        """Initialize empty inventory"""
+    def __init__(self, clock=None, feed_capacity: int = 10000,
+                 idempotency_capacity: int = 100_000, idempotency_ttl: float = 3600):
+        """
+        Initialize empty inventory.
+        
+        Args:
+            clock: Zero-argument callable returning the current time in
+                   seconds. Defaults to time.time; tests may inject a fake.
+            feed_capacity: Number of change events retained in self.changes
+            idempotency_capacity: Most idempotency keys remembered at once
+            idempotency_ttl: Seconds a keyed call's outcome is remembered
+        
+        Every mutating method also accepts an ``idempotency_key`` keyword;
+        retrying a call with the same key returns the first call's result
+        (or raises its error again) without repeating the change.
+        """
         self.sweets = []
+        self._by_id = {}
+        
+        # Stock per location; Sweet.quantity holds the running total
+        self._stock = StockTable()
+        self._clock = clock or time.time
+        self._lock = threading.RLock()
+        
+        # Name prefix index ranked by recent purchases
+        self._autocomplete = AutocompleteTrie(clock=self._clock)
+        
+        # MVCC state for snapshot(): the sweet list is copied on write while
+        # shared, and old field values are kept per sweet for live snapshots
+        self._snapshots = weakref.WeakSet()
+        self._sweets_shared = False
+        self._newest_snapshot_seq = 0
+        self._history = {}
+        self._last_write = {}
+        self._history_entries = 0
+        self._prune_history_at = _HISTORY_PRUNE_MIN
+        
+        # Change-data-capture feed of every mutation
+        self.changes = ChangeFeed(feed_capacity)
+        
+        # Sales history with time-bucketed rollups
+        self.ledger = SalesLedger(clock=self._clock)
+        
+        # Content hash tree for cheap reconciliation between inventories
+        self.merkle = MerkleIndex()
+        
+        # Cart reservations: holds are expired through a timing wheel
+        self._reservations = {}
+        self._held = {}
+        self._holds_by_sweet = {}
+        self._reservation_ids = itertools.count(1)
+        self._expiry_wheel = TimingWheel(start=self._clock())
+        
+        # Outcomes of calls made with an idempotency key, for safe retries
+        self._idempotency = IdempotencyCache(idempotency_capacity, idempotency_ttl, clock=self._clock)
     
+    @_synchronized
+    @_idempotent
     def add_sweet(self, sweet: Sweet):
         """
         Add a sweet to the inventory.
@@ -21,11 +156,19 @@ class Inventory:
         if not isinstance(sweet, Sweet):
             raise TypeError("Can only add Sweet objects to inventory")
             
-        if sweet in self.sweets:
+        if sweet.id in self._by_id:
             raise ValueError("Sweet ID already exists.")
             
+        self._unshare_sweets()
         self.sweets.append(sweet)
+        self._by_id[sweet.id] = sweet
+        self._stock.put(sweet.id, sweet.quantity)
+        self._autocomplete.insert(sweet.id, sweet.name)
+        self._rehash(sweet)
+        self.changes.publish(changefeed.ADDED, sweet.id, new=SweetRecord.from_sweet(sweet))
 
+    @_synchronized
+    @_idempotent
     def delete_sweet(self, sweet_id: int):
         """
         Remove a sweet from inventory by its ID.
@@ -40,12 +183,18 @@ class Inventory:
         if not isinstance(sweet_id, int):
             raise TypeError("Sweet ID must be an integer")
             
-        for i, sweet in enumerate(self.sweets):
-            if sweet.id == sweet_id:
-                del self.sweets[i]
-                return
+        sweet = self._by_id.pop(sweet_id, None)
+        
+        if sweet is None:
+            raise KeyError("Sweet not found.")
         
-        raise KeyError("Sweet not found.")
+        self._unshare_sweets()
+        self.sweets.remove(sweet)
+        self._autocomplete.remove(sweet_id)
+        self._stock.drop(sweet_id)
+        self._drop_holds(sweet_id)
+        self.merkle.update(sweet_id, None)
+        self.changes.publish(changefeed.DELETED, sweet_id, old=SweetRecord.from_sweet(sweet))
 
     def view_all_sweets(self):
         """
@@ -57,7 +206,8 @@ class Inventory:
         """
         return list(self.sweets)  # Return a copy of the list
 
-    def search_sweets(self, name=None, category=None, min_price=None, max_price=None) -> List[Sweet]:
+    def search_sweets(self, name=None, category=None, min_price=None, max_price=None,
+                      location=None) -> List[Sweet]:
         """
         Search sweets based on multiple filters.
         
@@ -66,6 +216,7 @@ class Inventory:
             category: Exact category to match
             min_price: Minimum price (inclusive)
             max_price: Maximum price (inclusive)
+            location: Only include sweets with stock at this location
             
         Returns:
             List of Sweet objects matching all specified filters
@@ -73,41 +224,29 @@ class Inventory:
         Raises:
             ValueError: If min_price > max_price
         """
-        if min_price is not None and max_price is not None and min_price > max_price:
-            raise ValueError("min_price cannot be greater than max_price")
-            
-        results = []
+        return filters.search_sweets(self._sweets_at(location), name, category, min_price, max_price)
+
+    def run_query(self, query: Query, location=None) -> List[Sweet]:
+        """
+        Run a prepared Query; same results as search_sweets() with its filters.
         
-        for sweet in self.sweets:
-            # Name filter (case-insensitive substring match)
-            name_match = True
-            if name is not None:
-                name_match = name.lower() in sweet.name.lower()
-            
-            # Category filter (exact match)
-            category_match = True
-            if category is not None:
-                category_match = category == sweet.category
-            
-            # Price range filter
-            price_match = True
-            if min_price is not None:
-                price_match = sweet.price >= min_price
-            if max_price is not None:
-                price_match = price_match and (sweet.price <= max_price)
+        Args:
+            query: Query prepared once and reused across calls
+            location: Only include sweets with stock at this location
             
-            if name_match and category_match and price_match:
-                results.append(sweet)
-        
-        return results
+        Returns:
+            List of matching Sweet objects
+        """
+        return query.select(self._sweets_at(location))
 
-    def sort_sweets(self, key: str, reverse: bool = False) -> List[Sweet]:
+    def sort_sweets(self, key: str, reverse: bool = False, location=None) -> List[Sweet]:
         """
         Return a sorted list of sweets based on the specified key.
         
         Args:
             key: Attribute to sort by ("name", "category", or "price")
             reverse: If True, sort in descending order
+            location: Only include sweets with stock at this location
             
         Returns:
             New list of Sweet objects in sorted order
@@ -115,24 +254,39 @@ class Inventory:
         Raises:
             ValueError: If key is not one of the supported sort keys
         """
-        valid_keys = {"name", "category", "price"}
-        if key not in valid_keys:
-            raise ValueError("Invalid sort key")
-            
         # Create a new sorted list without modifying the original
-        return sorted(
-            self.sweets,
-            key=lambda sweet: getattr(sweet, key),
-            reverse=reverse
-        )
+        return filters.sort_sweets(self._sweets_at(location), key, reverse)
+
+    def snapshot(self) -> InventorySnapshot:
+        """
+        Take a consistent, read-only view of the inventory.
+        
+        Building the snapshot is O(1): it shares the current sweet list and
+        relies on copy-on-write, so writers carry on while long reports run
+        against it. The snapshot's seq matches self.changes.last_seq, so a
+        replica can load the snapshot and then subscribe(after_seq=seq).
+        
+        Returns:
+            InventorySnapshot frozen at the current change-feed sequence
+        """
+        with self._lock:
+            snapshot = InventorySnapshot(self.sweets, self.changes.last_seq, self._history)
+            self._sweets_shared = True
+            self._newest_snapshot_seq = snapshot.seq
+            self._snapshots.add(snapshot)
+            return snapshot
 
-    def purchase_sweet(self, sweet_id: int, quantity: int):
+    @_synchronized
+    @_idempotent
+    def purchase_sweet(self, sweet_id: int, quantity: int, location: str = None):
         """
         Purchase a sweet by reducing its quantity in stock.
         
         Args:
             sweet_id: ID of the sweet to purchase
             quantity: Number of items to purchase
+            location: Location to sell from; None draws from the default
+                      location first and then from any other
             
         Raises:
             KeyError: If sweet with given ID is not found
@@ -145,19 +299,27 @@ class Inventory:
         
         if sweet is None:
             raise KeyError("Sweet not found.")
-            
-        if sweet.quantity < quantity:
+        
+        # Stock held in other carts is not for sale
+        self._expire_reservations()
+        if self._available(sweet) < quantity:
             raise ValueError("Not enough stock.")
-            
-        sweet.quantity -= quantity
+        
+        self._stock.take(sweet_id, quantity, location)
+        self._set_quantity(sweet, sweet.quantity - quantity)
+        self._record_sale(sweet, quantity)
     
-    def restock_sweet(self, sweet_id: int, quantity: int):
+    @_synchronized
+    @_idempotent
+    def restock_sweet(self, sweet_id: int, quantity: int, location: str = DEFAULT_LOCATION):
         """
         Restock a sweet by increasing its quantity in stock.
         
         Args:
             sweet_id: ID of the sweet to restock
             quantity: Number of items to add to stock
+            location: Location receiving the stock; None means the default
+                      location
             
         Raises:
             KeyError: If sweet with given ID is not found
@@ -165,20 +327,537 @@ class Inventory:
         """
         if quantity <= 0:
             raise ValueError("Invalid restock quantity.")
+        
+        if location is None:
+            location = DEFAULT_LOCATION
             
         sweet = self._find_sweet_by_id(sweet_id)
         
         if sweet is None:
             raise KeyError("Sweet not found.")
+        
+        self._stock.put(sweet_id, quantity, location)
+        self._set_quantity(sweet, sweet.quantity + quantity)
+        self.ledger.record(ledger.RESTOCK, sweet_id, sweet.category, quantity)
+    
+    @_synchronized
+    @_idempotent
+    def apply_stock_batch(self, sweet_id: int, deltas: List[int]) -> List[Optional[Exception]]:
+        """
+        Apply a burst of purchases and restocks of one sweet as a single update.
+        
+        Each request is checked in order against the running available
+        stock, exactly as separate purchase_sweet()/restock_sweet() calls
+        would be, but the accepted ones are applied with one quantity change,
+        one change event and one ledger entry per kind.
+        
+        Args:
+            sweet_id: ID of the sweet
+            deltas: Signed quantities; negative to purchase, positive to restock
+            
+        Returns:
+            For each delta, None if it was applied or the exception the
+            equivalent direct call would have raised
+        """
+        self._expire_reservations()
+        return self._apply_stock_batch(sweet_id, deltas)
+
+    @_synchronized
+    @_idempotent
+    def apply_stock_batches(self, batches: Dict[int, List[int]]) -> Dict[int, List[Optional[Exception]]]:
+        """
+        Apply apply_stock_batch() to many sweets under a single lock.
+        
+        A failure while applying one sweet's batch is reported for each of
+        that sweet's deltas and does not stop the other sweets.
+        
+        Args:
+            batches: Signed quantities per sweet ID, each list in arrival order
+            
+        Returns:
+            Outcomes per sweet ID, as apply_stock_batch() returns them
+        """
+        self._expire_reservations()
+        results = {}
+        for sweet_id, deltas in batches.items():
+            try:
+                results[sweet_id] = self._apply_stock_batch(sweet_id, deltas)
+            except Exception as e:
+                # Returned, and possibly cached, rather than raised
+                results[sweet_id] = [e.with_traceback(None)] * len(deltas)
+        return results
+
+    @_synchronized
+    @_idempotent
+    def transfer_stock(self, sweet_id: int, quantity: int, from_location: str, to_location: str):
+        """
+        Move stock of a sweet between locations; the total is unchanged.
+        
+        Args:
+            sweet_id: ID of the sweet to move
+            quantity: Number of items to move
+            from_location: Location giving up the stock
+            to_location: Location receiving the stock
+            
+        Raises:
+            KeyError: If sweet with given ID is not found
+            TypeError: If either location is None
+            ValueError: If quantity is invalid, the locations are the same,
+                        or the source does not hold enough stock
+        """
+        if from_location is None or to_location is None:
+            raise TypeError("Both locations must be given.")
+        
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        
+        if from_location == to_location:
+            raise ValueError("Source and destination must differ.")
+        
+        if self._find_sweet_by_id(sweet_id) is None:
+            raise KeyError("Sweet not found.")
+        
+        self._stock.take(sweet_id, quantity, from_location)
+        self._stock.put(sweet_id, quantity, to_location)
+
+    def stock_by_location(self, sweet_id: int) -> Dict[str, int]:
+        """
+        Return where a sweet is in stock.
+        
+        Args:
+            sweet_id: ID of the sweet
             
-        sweet.quantity += quantity
+        Returns:
+            Dict mapping each location that holds stock to its quantity
+            
+        Raises:
+            KeyError: If sweet with given ID is not found
+        """
+        if self._find_sweet_by_id(sweet_id) is None:
+            raise KeyError("Sweet not found.")
+        
+        return self._stock.locations(sweet_id)
+
+    @_synchronized
+    def autocomplete(self, prefix: str, k: int = 5) -> List[Sweet]:
+        """
+        Suggest sweets whose name starts with the typed prefix.
+        
+        Cost depends only on the prefix length and k, not on the size of the
+        inventory, so front-ends can call this on every keystroke.
+        
+        Args:
+            prefix: Case-insensitive start of the sweet name
+            k: Maximum number of suggestions
+            
+        Returns:
+            Up to k Sweet objects, most purchased recently first
+        """
+        return [self._by_id[sweet_id] for sweet_id in self._autocomplete.complete(prefix, k)]
+
+    @_synchronized
+    @_idempotent
+    def update_price(self, sweet_id: int, price: float):
+        """
+        Change the unit price of a sweet.
+        
+        Args:
+            sweet_id: ID of the sweet to reprice
+            price: New price per unit
+            
+        Raises:
+            KeyError: If sweet with given ID is not found
+            ValueError: If price is not positive
+        """
+        if price <= 0:
+            raise ValueError("Price must be positive")
+            
+        sweet = self._find_sweet_by_id(sweet_id)
+        
+        if sweet is None:
+            raise KeyError("Sweet not found.")
+        
+        self._set_price(sweet, price)
     
+    def diff(self, other: "Inventory") -> List[int]:
+        """
+        Find the sweets that differ between this inventory and another.
+        
+        Identical inventories are recognised with a single root-hash
+        comparison; otherwise only the ID ranges whose hashes disagree are
+        examined.
+        
+        Args:
+            other: Inventory to compare against
+            
+        Returns:
+            Sorted IDs that are missing from one side or have different fields
+        """
+        return self.merkle.diff(other.merkle)
+
+    def make_patch(self, sweet_ids) -> Dict[int, Optional[SweetRecord]]:
+        """
+        Collect the current state of the given sweets for apply_patch().
+        
+        Args:
+            sweet_ids: IDs to export, typically the result of diff()
+            
+        Returns:
+            Dict mapping each ID to its SweetRecord, or None if absent here
+        """
+        with self._lock:
+            return {
+                sweet_id: SweetRecord.from_sweet(self._by_id[sweet_id]) if sweet_id in self._by_id else None
+                for sweet_id in sweet_ids
+            }
+
+    @_synchronized
+    @_idempotent
+    def apply_patch(self, patch: Dict[int, Optional[SweetRecord]]):
+        """
+        Bring the given sweets in line with a patch from make_patch().
+        
+        Sweets mapped to None are deleted, unknown sweets are added, and
+        existing sweets get the patched price and quantity, with quantity
+        differences booked at the default location. A sweet whose name or
+        category changed is replaced by a new Sweet object. If a lowered
+        quantity no longer covers the stock held in carts, the newest
+        reservations on that sweet are released until it does.
+        
+        Args:
+            patch: Dict mapping sweet IDs to SweetRecord or None
+        """
+        for sweet_id, record in patch.items():
+            sweet = self._by_id.get(sweet_id)
+            if record is None:
+                if sweet is not None:
+                    self.delete_sweet(sweet_id)
+                continue
+            
+            if sweet is not None and (sweet.name, sweet.category) != (record.name, record.category):
+                self.delete_sweet(sweet_id)
+                sweet = None
+            
+            if sweet is None:
+                self.add_sweet(Sweet(**record._asdict()))
+            else:
+                self._set_price(sweet, record.price)
+                delta = record.quantity - sweet.quantity
+                if delta > 0:
+                    self._stock.put(sweet_id, delta)
+                elif delta < 0:
+                    self._stock.take(sweet_id, -delta)
+                if delta:
+                    self._set_quantity(sweet, record.quantity)
+                if delta < 0:
+                    self._release_excess_holds(sweet)
+
+    def sync_from(self, other: "Inventory") -> List[int]:
+        """
+        Copy every difference from another inventory into this one.
+        
+        Args:
+            other: Inventory to treat as the source of truth
+            
+        Returns:
+            IDs of the sweets that were changed
+        """
+        sweet_ids = self.diff(other)
+        if sweet_ids:
+            self.apply_patch(other.make_patch(sweet_ids))
+        return sweet_ids
+
+    @_synchronized
+    def available_quantity(self, sweet_id: int) -> int:
+        """
+        Return the stock of a sweet that is free to sell.
+        
+        Args:
+            sweet_id: ID of the sweet
+            
+        Returns:
+            On-hand quantity minus the quantity held by live reservations
+            
+        Raises:
+            KeyError: If sweet with given ID is not found
+        """
+        sweet = self._find_sweet_by_id(sweet_id)
+        
+        if sweet is None:
+            raise KeyError("Sweet not found.")
+        
+        self._expire_reservations()
+        return self._available(sweet)
+
+    @_synchronized
+    @_idempotent
+    def reserve(self, sweet_id: int, quantity: int, ttl: float) -> Reservation:
+        """
+        Hold stock of a sweet for a limited time, e.g. while it sits in a cart.
+        
+        The hold must be finished with commit_reservation() or
+        release_reservation(); otherwise it lapses after ttl seconds.
+        
+        Args:
+            sweet_id: ID of the sweet to hold
+            quantity: Number of items to hold
+            ttl: Seconds until the hold expires
+            
+        Returns:
+            The new Reservation
+            
+        Raises:
+            KeyError: If sweet with given ID is not found
+            ValueError: If quantity or ttl is invalid or stock is insufficient
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        
+        if ttl <= 0:
+            raise ValueError("TTL must be positive.")
+            
+        sweet = self._find_sweet_by_id(sweet_id)
+        
+        if sweet is None:
+            raise KeyError("Sweet not found.")
+        
+        now = self._clock()
+        self._expire_reservations(now)
+        if self._available(sweet) < quantity:
+            raise ValueError("Not enough stock.")
+        
+        reservation = Reservation(
+            id=next(self._reservation_ids),
+            sweet_id=sweet_id,
+            quantity=quantity,
+            expires_at=now + ttl
+        )
+        self._reservations[reservation.id] = reservation
+        self._held[sweet_id] = self._held.get(sweet_id, 0) + quantity
+        self._holds_by_sweet.setdefault(sweet_id, set()).add(reservation.id)
+        self._expiry_wheel.schedule(reservation.id, reservation.expires_at)
+        return reservation
+
+    @_synchronized
+    @_idempotent
+    def commit_reservation(self, reservation_id: int):
+        """
+        Turn a reservation into a purchase of the held stock.
+        
+        Args:
+            reservation_id: ID of the reservation to commit
+            
+        Raises:
+            KeyError: If the reservation is unknown, already finished or expired
+            ValueError: If the sweet no longer has the held stock on hand;
+                        the reservation is kept
+        """
+        self._expire_reservations()
+        reservation = self._reservations.get(reservation_id)
+        
+        if reservation is None:
+            raise KeyError("Reservation not found.")
+        
+        sweet = self._find_sweet_by_id(reservation.sweet_id)
+        if sweet.quantity < reservation.quantity:
+            raise ValueError("Not enough stock.")
+        
+        self._take_reservation(reservation_id)
+        self._stock.take(sweet.id, reservation.quantity)
+        self._set_quantity(sweet, sweet.quantity - reservation.quantity)
+        self._record_sale(sweet, reservation.quantity)
+
+    @_synchronized
+    @_idempotent
+    def release_reservation(self, reservation_id: int):
+        """
+        Cancel a reservation and return the held stock to sale.
+        
+        Args:
+            reservation_id: ID of the reservation to release
+            
+        Raises:
+            KeyError: If the reservation is unknown, already finished or expired
+        """
+        self._take_reservation(reservation_id)
+
+    def _apply_stock_batch(self, sweet_id: int, deltas: List[int]) -> List[Optional[Exception]]:
+        """Helper method applying one sweet's deltas; reservations must be expired first"""
+        sweet = self._find_sweet_by_id(sweet_id)
+        
+        if sweet is None:
+            return [KeyError("Sweet not found.") for _ in deltas]
+        
+        available = self._available(sweet)
+        outcomes = []
+        sold = restocked = 0
+        for delta in deltas:
+            if delta == 0:
+                outcomes.append(ValueError("Quantity must be positive."))
+            elif delta > 0:
+                available += delta
+                restocked += delta
+                outcomes.append(None)
+            elif available < -delta:
+                outcomes.append(ValueError("Not enough stock."))
+            else:
+                available += delta
+                sold -= delta
+                outcomes.append(None)
+        
+        if restocked:
+            self._stock.put(sweet_id, restocked)
+            self.ledger.record(ledger.RESTOCK, sweet_id, sweet.category, restocked)
+        if sold:
+            self._stock.take(sweet_id, sold)
+            self._record_sale(sweet, sold)
+        if restocked or sold:
+            self._set_quantity(sweet, sweet.quantity + restocked - sold)
+        return outcomes
+
+    def _take_reservation(self, reservation_id: int) -> Reservation:
+        """Helper method to remove a live reservation and its hold"""
+        self._expire_reservations()
+        reservation = self._reservations.get(reservation_id)
+        
+        if reservation is None:
+            raise KeyError("Reservation not found.")
+        
+        self._expiry_wheel.cancel(reservation_id)
+        self._remove_hold(reservation)
+        return reservation
+
+    def _remove_hold(self, reservation: Reservation):
+        """Helper method to forget a reservation and its held quantity"""
+        del self._reservations[reservation.id]
+        
+        held = self._held[reservation.sweet_id] - reservation.quantity
+        if held:
+            self._held[reservation.sweet_id] = held
+        else:
+            del self._held[reservation.sweet_id]
+        
+        holds = self._holds_by_sweet[reservation.sweet_id]
+        holds.discard(reservation.id)
+        if not holds:
+            del self._holds_by_sweet[reservation.sweet_id]
+
+    def _expire_reservations(self, now: float = None):
+        """Helper method to release every reservation whose TTL has passed"""
+        if now is None:
+            now = self._clock()
+        for reservation_id in self._expiry_wheel.advance(now):
+            self._remove_hold(self._reservations[reservation_id])
+
+    def _drop_holds(self, sweet_id: int):
+        """Helper method to discard all reservations on a deleted sweet"""
+        for reservation_id in list(self._holds_by_sweet.get(sweet_id, ())):
+            self._expiry_wheel.cancel(reservation_id)
+            self._remove_hold(self._reservations[reservation_id])
+
+    def _release_excess_holds(self, sweet: Sweet):
+        """Helper method to release the newest holds until stock covers the rest"""
+        holds = sorted(self._holds_by_sweet.get(sweet.id, ()), reverse=True)
+        for reservation_id in holds:
+            if self._available(sweet) >= 0:
+                break
+            self._expiry_wheel.cancel(reservation_id)
+            self._remove_hold(self._reservations[reservation_id])
+
+    def _set_quantity(self, sweet: Sweet, quantity: int):
+        """Helper method to change stock on hand and publish the change"""
+        old_quantity = sweet.quantity
+        self._preserve(sweet)
+        sweet.quantity = quantity
+        self._rehash(sweet)
+        self.changes.publish(changefeed.QUANTITY_CHANGED, sweet.id, old=old_quantity, new=quantity)
+
+    def _set_price(self, sweet: Sweet, price: float):
+        """Helper method to change the unit price and publish the change"""
+        if sweet.price == price:
+            return
+        old_price = sweet.price
+        self._preserve(sweet)
+        sweet.price = price
+        self._rehash(sweet)
+        self.changes.publish(changefeed.PRICE_CHANGED, sweet.id, old=old_price, new=price)
+
+    def _rehash(self, sweet: Sweet):
+        """Helper method to refresh a sweet's entry in the hash tree"""
+        self.merkle.update(sweet.id, merkle.digest(sweet))
+
+    def _record_sale(self, sweet: Sweet, quantity: int):
+        """Helper method to log a sale and count it towards popularity"""
+        self.ledger.record(ledger.PURCHASE, sweet.id, sweet.category, quantity)
+        self._autocomplete.record_purchase(sweet.id, quantity)
+
+    def _preserve(self, sweet: Sweet):
+        """Helper method to keep a sweet's current state for live snapshots"""
+        if not self._snapshots:
+            if self._history:
+                self._history.clear()
+                self._last_write.clear()
+                self._history_entries = 0
+                self._prune_history_at = _HISTORY_PRUNE_MIN
+            return
+        
+        # The pending write will be published with the next sequence number
+        seq = self.changes.last_seq + 1
+        key = id(sweet)
+        if self._newest_snapshot_seq >= self._last_write.get(key, 0):
+            self._history.setdefault(key, []).append((seq, SweetRecord.from_sweet(sweet)))
+            self._history_entries += 1
+            if self._history_entries > self._prune_history_at:
+                self._prune_history()
+        self._last_write[key] = seq
+
+    def _prune_history(self):
+        """Helper method to drop versions that no live snapshot can read"""
+        # A snapshot at seq S reads the first version valid until after S, so
+        # a version is needed only if a live snapshot falls between it and
+        # the version before it
+        live = sorted({snapshot.seq for snapshot in self._snapshots})
+        kept_entries = 0
+        for key, versions in list(self._history.items()):
+            kept = []
+            previous = 0
+            for version in versions:
+                needed = bisect.bisect_left(live, previous)
+                if needed < len(live) and live[needed] < version[0]:
+                    kept.append(version)
+                previous = version[0]
+            
+            # Swap in a new list: snapshot readers may be iterating the old one
+            if kept:
+                self._history[key] = kept
+                kept_entries += len(kept)
+            else:
+                del self._history[key]
+                self._last_write.pop(key, None)
+        
+        self._history_entries = kept_entries
+        self._prune_history_at = max(_HISTORY_PRUNE_MIN, 2 * kept_entries)
+
+    def _unshare_sweets(self):
+        """Helper method to copy the sweet list before changing it under a snapshot"""
+        if self._sweets_shared:
+            self.sweets = list(self.sweets)
+            self._sweets_shared = False
+
+    def _available(self, sweet: Sweet) -> int:
+        """Helper method to compute unreserved stock of a sweet"""
+        return sweet.quantity - self._held.get(sweet.id, 0)
+
+    def _sweets_at(self, location: str = None) -> List[Sweet]:
+        """Helper method to narrow the sweet list to those in stock at a location"""
+        if location is None:
+            return self.sweets
+        in_stock = self._stock.in_stock_at(location)
+        return [sweet for sweet in self.sweets if sweet.id in in_stock]
+
     def _find_sweet_by_id(self, sweet_id: int) -> Sweet:
         """Helper method to find sweet by ID"""
-        for sweet in self.sweets:
-            if sweet.id == sweet_id:
-                return sweet
-        return None
+        return self._by_id.get(sweet_id)
 
 if __name__ == '__main__':
     pass
\ No newline at end of file
@@ -0,0 +1,285 @@
+import time
+from array import array
+from typing import Dict, Iterator, NamedTuple
+
+PURCHASE = 0
+RESTOCK = 1
+
+# Rollup bucket widths in minutes, finest first
+_MINUTE, _HOUR, _DAY = 1, 60, 1440
+_GRANULARITIES = (_MINUTE, _HOUR, _DAY)
+
+
+class _Totals:
+    """
+    Units sold and restocked per key within one rollup bucket.
+
+    While its period is open, a bucket maps keys to positions in two packed
+    counter arrays. Once the period is over it is frozen: the dict is
+    replaced by a packed array of the keys, so a closed bucket costs 24
+    bytes per key. A late event thaws it again.
+    """
+
+    __slots__ = ("slots", "keys", "sold", "restocked")
+
+    def __init__(self):
+        self.slots = {}
+        self.keys = None
+        self.sold = array("q")
+        self.restocked = array("q")
+
+    def add(self, key, kind: int, quantity: int):
+        """Add quantity to one key's counter for kind"""
+        slots = self.slots
+        if slots is None:
+            slots = self.slots = {k: i for i, k in enumerate(self.keys)}
+            self.keys = None
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = len(self.sold)
+            self.sold.append(0)
+            self.restocked.append(0)
+        if kind == PURCHASE:
+            self.sold[slot] += quantity
+        else:
+            self.restocked[slot] += quantity
+
+    def freeze(self):
+        """Pack the keys into an array and trim the counters to size"""
+        if self.slots is None:
+            return
+        try:
+            self.keys = array("q", self.slots)
+        except (TypeError, OverflowError):
+            self.keys = tuple(self.slots)
+        self.slots = None
+        self.sold = array("q", self.sold)
+        self.restocked = array("q", self.restocked)
+
+    def sum_into(self, result: dict, kind: int):
+        """Add this bucket's non-zero counters for kind into result"""
+        # Slots are handed out in insertion order, so the dict's keys line
+        # up with the counter arrays just like the frozen key array does
+        keys = self.slots if self.keys is None else self.keys
+        counts = self.sold if kind == PURCHASE else self.restocked
+        get = result.get
+        for key, units in zip(keys, counts):
+            if units:
+                result[key] = get(key, 0) + units
+
+
+class LedgerEntry(NamedTuple):
+    """One purchase or restock as stored in the ledger"""
+
+    timestamp: float
+    kind: int
+    sweet_id: int
+    category: str
+    quantity: int
+
+
+class SalesLedger:
+    """
+    Append-only history of purchases and restocks.
+
+    Events are stored column-wise in packed arrays (29 bytes each)
+    rather than as one object per event. Alongside the raw columns the ledger
+    keeps running per-minute, per-hour and per-day totals for every sweet and
+    every category, packed into arrays. Every event is added at all three
+    levels; minute buckets are dropped once older than ``minute_retention``,
+    while hour and day buckets cover the whole history. Windowed questions
+    are answered from these rollups alone, summing at most a few hundred
+    buckets and never scanning raw events. Window edges are widened to whole
+    minutes, or to whole hours where minute buckets are no longer kept.
+    """
+
+    def __init__(self, clock=None, minute_retention: float = 2 * 3600):
+        """
+        Initialize an empty ledger.
+
+        Args:
+            clock: Zero-argument callable returning the current time, used
+                   as the default end of query windows
+            minute_retention: Seconds of history kept at minute resolution
+
+        Raises:
+            ValueError: If minute_retention is not positive
+        """
+        if minute_retention <= 0:
+            raise ValueError("Retention must be positive.")
+
+        self._clock = clock or time.time
+        self._timestamps = array("d")
+        self._kinds = array("b")
+        self._sweet_ids = array("q")
+        self._category_codes = array("i")
+        self._quantities = array("q")
+
+        self._categories = []
+        self._category_index = {}
+
+        # granularity -> bucket -> (totals by sweet ID, totals by category code)
+        self._rollups = {g: {} for g in _GRANULARITIES}
+        self._minute_retention = int(minute_retention // 60)
+        # Minute buckets are kept from minute_floor on, an hour boundary
+        self._latest_minute = None
+        self._minute_floor = float("-inf")
+        # (granularity, bucket, totals) still taking writes, frozen once over
+        self._open = []
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def record(self, kind: int, sweet_id: int, category: str, quantity: int, timestamp: float = None):
+        """
+        Append an event and update the rollups.
+
+        Args:
+            kind: PURCHASE or RESTOCK
+            sweet_id: ID of the sweet
+            category: Category of the sweet at the time of the event
+            quantity: Units sold or restocked
+            timestamp: Event time; defaults to the ledger clock
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+
+        code = self._category_index.get(category)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(category)
+            self._category_index[category] = code
+
+        self._timestamps.append(timestamp)
+        self._kinds.append(kind)
+        self._sweet_ids.append(sweet_id)
+        self._category_codes.append(code)
+        self._quantities.append(quantity)
+
+        minute = int(timestamp // 60)
+        if self._latest_minute is None or minute > self._latest_minute:
+            self._latest_minute = minute
+            self._compact()
+
+        for granularity in _GRANULARITIES:
+            if granularity == _MINUTE and minute < self._minute_floor:
+                continue
+            buckets = self._rollups[granularity]
+            bucket = minute // granularity
+            totals = buckets.get(bucket)
+            if totals is None:
+                totals = buckets[bucket] = (_Totals(), _Totals())
+                self._open.append((granularity, bucket, totals))
+            elif totals[0].slots is None:
+                self._open.append((granularity, bucket, totals))
+            totals[0].add(sweet_id, kind, quantity)
+            totals[1].add(code, kind, quantity)
+
+    def entries(self) -> Iterator[LedgerEntry]:
+        """Yield every recorded event in the order it was recorded"""
+        categories = self._categories
+        for i in range(len(self._timestamps)):
+            yield LedgerEntry(self._timestamps[i], self._kinds[i], self._sweet_ids[i],
+                              categories[self._category_codes[i]], self._quantities[i])
+
+    def units_sold(self, start: float, end: float = None, by: str = "category") -> Dict:
+        """
+        Total units sold in a time window, grouped by category or sweet.
+
+        The window edges are widened to whole minutes, or to whole hours
+        before the ledger's minute retention.
+
+        Args:
+            start: Window start time (inclusive)
+            end: Window end time (exclusive); defaults to now, inclusive
+            by: "category" or "sweet"
+
+        Returns:
+            Dict mapping category name or sweet ID to units sold
+
+        Raises:
+            ValueError: If by is not supported or start > end
+        """
+        return self._totals(PURCHASE, start, end, by)
+
+    def units_restocked(self, start: float, end: float = None, by: str = "category") -> Dict:
+        """
+        Total units restocked in a time window; see units_sold().
+
+        Raises:
+            ValueError: If by is not supported or start > end
+        """
+        return self._totals(RESTOCK, start, end, by)
+
+    def _totals(self, kind: int, start: float, end: float, by: str) -> Dict:
+        """Sum the rollup buckets covering [start, end)"""
+        if by not in ("category", "sweet"):
+            raise ValueError("Invalid grouping")
+
+        if end is None:
+            # Open-ended windows include everything up to this moment
+            end = self._clock()
+            last_minute = int(end // 60) + 1
+        else:
+            last_minute = -int(-end // 60)
+        if start > end:
+            raise ValueError("start cannot be after end")
+
+        first_minute = int(start // 60)
+        if self._latest_minute is not None:
+            last_minute = min(last_minute, self._latest_minute + 1)
+
+        # Minute buckets before the floor are gone, so edges there are
+        # widened to hours; the floor itself is an hour boundary
+        floor = self._minute_floor
+        if first_minute < floor:
+            first_minute = first_minute // _HOUR * _HOUR
+        if last_minute < floor:
+            last_minute = -(-last_minute // _HOUR) * _HOUR
+
+        which = 0 if by == "sweet" else 1
+        result = {}
+        for granularity, bucket in _cover(first_minute, last_minute):
+            totals = self._rollups[granularity].get(bucket)
+            if totals is not None:
+                totals[which].sum_into(result, kind)
+
+        if by == "category":
+            return {self._categories[code]: units for code, units in result.items()}
+        return result
+
+    def _compact(self):
+        """Freeze buckets whose period is over and drop expired minutes"""
+        latest = self._latest_minute
+        still_open = []
+        for granularity, bucket, totals in self._open:
+            if (bucket + 1) * granularity <= latest:
+                totals[0].freeze()
+                totals[1].freeze()
+            else:
+                still_open.append((granularity, bucket, totals))
+        self._open = still_open
+
+        floor = (latest - self._minute_retention) // _HOUR * _HOUR
+        if floor > self._minute_floor:
+            self._minute_floor = floor
+            minutes = self._rollups[_MINUTE]
+            for bucket in [b for b in minutes if b < floor]:
+                del minutes[bucket]
+
+
+def _cover(first: int, last: int):
+    """
+    Split the minute range [first, last) into the fewest aligned buckets.
+
+    Yields (granularity, bucket) pairs: leading minutes up to an hour
+    boundary, hours up to a day boundary, whole days, then the trailing
+    hours and minutes.
+    """
+    minute = first
+    while minute < last:
+        for granularity in reversed(_GRANULARITIES):
+            if minute % granularity == 0 and minute + granularity <= last:
+                yield granularity, minute // granularity
+                minute += granularity
+                break
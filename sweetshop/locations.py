@@ -0,0 +1,97 @@
+from typing import Dict, Set
+
+DEFAULT_LOCATION = "main"
+
+
+class StockTable:
+    """
+    Per-location stock levels for every sweet.
+
+    Only locations that actually hold stock are stored, both per sweet and
+    per location, so "where is this in stock" and "what is in stock here"
+    cost O(locations-with-stock) and O(1) respectively. The inventory keeps
+    the total across locations in Sweet.quantity as a running sum.
+    """
+
+    def __init__(self):
+        """Initialize an empty table"""
+        self._stock = {}
+        self._in_stock_at = {}
+
+    def quantity(self, sweet_id: int, location: str) -> int:
+        """Return the stock of a sweet at one location"""
+        return self._stock.get(sweet_id, {}).get(location, 0)
+
+    def locations(self, sweet_id: int) -> Dict[str, int]:
+        """Return a copy of the locations holding a sweet and their stock"""
+        return dict(self._stock.get(sweet_id, {}))
+
+    def in_stock_at(self, location: str) -> Set[int]:
+        """Return the (live) set of sweet IDs with stock at a location"""
+        return self._in_stock_at.get(location, set())
+
+    def put(self, sweet_id: int, quantity: int, location: str = DEFAULT_LOCATION):
+        """
+        Add stock of a sweet at a location.
+
+        Raises:
+            TypeError: If location is None; stock is always put somewhere
+        """
+        if location is None:
+            raise TypeError("Location must be given.")
+        if quantity <= 0:
+            return
+        row = self._stock.setdefault(sweet_id, {})
+        if location not in row:
+            self._in_stock_at.setdefault(location, set()).add(sweet_id)
+        row[location] = row.get(location, 0) + quantity
+
+    def take(self, sweet_id: int, quantity: int, location: str = None):
+        """
+        Remove stock of a sweet from one location, or from any if None.
+
+        Without a location, stock is drawn from DEFAULT_LOCATION first and
+        then from the fullest locations.
+
+        Raises:
+            ValueError: If the location(s) do not hold enough stock
+        """
+        row = self._stock.get(sweet_id, {})
+        if location is not None:
+            if row.get(location, 0) < quantity:
+                raise ValueError("Not enough stock.")
+            self._reduce(sweet_id, row, location, quantity)
+            return
+
+        if sum(row.values()) < quantity:
+            raise ValueError("Not enough stock.")
+        order = sorted(row, key=lambda loc: (loc != DEFAULT_LOCATION, -row[loc]))
+        for loc in order:
+            if not quantity:
+                break
+            taken = min(quantity, row[loc])
+            self._reduce(sweet_id, row, loc, taken)
+            quantity -= taken
+
+    def drop(self, sweet_id: int):
+        """Forget all stock of a sweet"""
+        for location in self._stock.pop(sweet_id, {}):
+            self._discard(sweet_id, location)
+
+    def _reduce(self, sweet_id: int, row: dict, location: str, quantity: int):
+        """Lower one cell, removing it once empty"""
+        remaining = row[location] - quantity
+        if remaining:
+            row[location] = remaining
+            return
+        del row[location]
+        if not row:
+            del self._stock[sweet_id]
+        self._discard(sweet_id, location)
+
+    def _discard(self, sweet_id: int, location: str):
+        """Remove a sweet from a location's in-stock set"""
+        ids = self._in_stock_at[location]
+        ids.discard(sweet_id)
+        if not ids:
+            del self._in_stock_at[location]
@@ -0,0 +1,122 @@
+import hashlib
+from typing import List
+
+# Sweets per leaf range and children per inner node, as bit widths
+LEAF_BITS = 4
+FANOUT_BITS = 4
+# Enough levels that every 64-bit sweet ID falls under a single root
+LEVELS = (64 - LEAF_BITS) // FANOUT_BITS + 1
+
+_MODULUS = 1 << 128
+
+
+def digest(record) -> int:
+    """Return a 128-bit content hash of a sweet's fields"""
+    # Prices compare equal across int and float (3 == 3.0), so they must
+    # hash equal too, or a sync would see a difference it never applies
+    data = repr((record.id, record.name, record.category, float(record.price), record.quantity))
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=16).digest(), "big")
+
+
+class MerkleIndex:
+    """
+    Hash tree over an inventory, partitioned by sweet ID range.
+
+    Leaves cover 2**LEAF_BITS consecutive IDs and each inner node covers
+    2**FANOUT_BITS children. A node's hash is the sum (mod 2**128) of the
+    digests beneath it, so a single changed sweet updates one node per level
+    without rehashing siblings. Two indexes with equal root hashes hold the
+    same sweets; otherwise diff() descends only into the ranges whose hashes
+    disagree. Nodes are stored sparsely, so empty ID ranges cost nothing.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._leaves = {}
+        # level -> node key -> [hash, count]; level 0 mirrors the leaves
+        self._levels = [{} for _ in range(LEVELS)]
+        self._root = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def root_hash(self) -> int:
+        """Hash of the whole inventory; equal roots mean equal contents"""
+        return self._root
+
+    def update(self, sweet_id: int, new_digest: int = None):
+        """
+        Set (or with None, remove) the digest stored for a sweet.
+
+        Args:
+            sweet_id: ID of the sweet
+            new_digest: digest() of the sweet's current fields, or None
+        """
+        leaf_key = sweet_id >> LEAF_BITS
+        leaf = self._leaves.get(leaf_key)
+        old_digest = leaf.get(sweet_id) if leaf else None
+        if old_digest == new_digest:
+            return
+
+        if new_digest is None:
+            del leaf[sweet_id]
+            if not leaf:
+                del self._leaves[leaf_key]
+        else:
+            if leaf is None:
+                leaf = self._leaves[leaf_key] = {}
+            leaf[sweet_id] = new_digest
+
+        delta = (new_digest or 0) - (old_digest or 0)
+        count_delta = (new_digest is not None) - (old_digest is not None)
+        key = leaf_key
+        for level in self._levels:
+            node = level.get(key)
+            if node is None:
+                node = level[key] = [0, 0]
+            node[0] = (node[0] + delta) % _MODULUS
+            node[1] += count_delta
+            if not node[1]:
+                del level[key]
+            key >>= FANOUT_BITS
+
+        self._root = (self._root + delta) % _MODULUS
+        self._count += count_delta
+
+    def diff(self, other: "MerkleIndex") -> List[int]:
+        """
+        Find the sweets whose contents differ between two indexes.
+
+        Only subtrees whose hashes disagree are visited, so a handful of
+        differences costs O(changes x LEVELS x fan-out) however many sweets
+        the indexes hold.
+
+        Returns:
+            Sorted IDs present in only one index or with different contents
+        """
+        if self._root == other._root and self._count == other._count:
+            return []
+
+        top = LEVELS - 1
+        stack = [(top, key) for key in self._levels[top].keys() | other._levels[top].keys()]
+        changed = []
+        while stack:
+            level, key = stack.pop()
+            if self._levels[level].get(key) == other._levels[level].get(key):
+                continue
+
+            if level == 0:
+                mine = self._leaves.get(key, {})
+                theirs = other._leaves.get(key, {})
+                changed.extend(sweet_id for sweet_id in mine.keys() | theirs.keys()
+                               if mine.get(sweet_id) != theirs.get(sweet_id))
+                continue
+
+            first_child = key << FANOUT_BITS
+            for child in range(first_child, first_child + (1 << FANOUT_BITS)):
+                if child in self._levels[level - 1] or child in other._levels[level - 1]:
+                    stack.append((level - 1, child))
+
+        return sorted(changed)
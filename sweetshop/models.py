@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 class Sweet:
     """Represents a sweet item in the inventory"""
     
@@ -35,4 +37,18 @@ class Sweet:
         """Two sweets are equal if their IDs match"""
         if not isinstance(other, Sweet):
             return False
-        return self.id == other.id
\ No newline at end of file
+        return self.id == other.id
+
+class SweetRecord(NamedTuple):
+    """Immutable point-in-time copy of a Sweet's fields"""
+    
+    id: int
+    name: str
+    category: str
+    price: float
+    quantity: int
+    
+    @classmethod
+    def from_sweet(cls, sweet: "Sweet") -> "SweetRecord":
+        """Capture the current state of a sweet"""
+        return cls(sweet.id, sweet.name, sweet.category, sweet.price, sweet.quantity)
@@ -0,0 +1,118 @@
+import functools
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+
+class Query:
+    """
+    A search whose filters are validated and compiled once.
+
+    Only the active checks end up in the predicate, cheapest first, the
+    name is lowercased once, and a two-sided price range becomes a single
+    chained comparison. Running the query is then a single list
+    comprehension over the sweets with no per-record branching on which
+    filters were given. Matches are the same as search_sweets() with the
+    same arguments.
+
+    Compiled predicates are cached per combination of active filters, so
+    building a Query costs about a microsecond and search_sweets(), which
+    builds one per call, is just as fast per record. Keep a Query to pass a
+    filter set around or to run it against different sources, not for speed.
+    """
+
+    def __init__(self, name=None, category=None, min_price=None, max_price=None):
+        """
+        Prepare a query.
+
+        Args:
+            name: Case-insensitive substring to search in sweet names
+            category: Exact category to match
+            min_price: Minimum price (inclusive)
+            max_price: Maximum price (inclusive)
+
+        Raises:
+            ValueError: If min_price > max_price
+        """
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price cannot be greater than max_price")
+
+        self.name = name
+        self.category = category
+        self.min_price = min_price
+        self.max_price = max_price
+
+        # An empty name matches every sweet, so it needs no check at all
+        shape = (bool(name), category is not None, min_price is not None, max_price is not None)
+        needle = name.lower() if name else None
+        self.matches, self._select = _compile(shape)(needle, category, min_price, max_price)
+
+    def __repr__(self):
+        active = ", ".join(f"{field}={getattr(self, field)!r}"
+                           for field in ("name", "category", "min_price", "max_price")
+                           if getattr(self, field) is not None)
+        return f"Query({active})"
+
+    def select(self, sweets: Iterable) -> List:
+        """Return the sweets (or sweet records) that match, in order"""
+        return self._select(sweets)
+
+    def iter(self, sweets: Iterable) -> Iterator:
+        """Lazily yield the sweets that match, reading sweets as consumed"""
+        return filter(self.matches, sweets)
+
+    def run(self, source, location=None) -> List:
+        """
+        Run the query against an Inventory, a snapshot, or a batch of sweets.
+
+        Args:
+            source: Inventory, InventorySnapshot, or any iterable of sweets
+            location: Only include sweets with stock at this location
+                      (Inventory only)
+
+        Returns:
+            List of matching sweets
+        """
+        run_query = getattr(source, "run_query", None)
+        if run_query is not None:
+            return run_query(self, location)
+        return self._select(source)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(shape: Tuple[bool, bool, bool, bool]) -> Callable:
+    """
+    Build the predicate factory for one combination of active filters.
+
+    There are only 16 combinations, so each is compiled once and cached;
+    the filter values are bound as closure variables, never spliced into
+    the source. Generated code is used because one inlined condition avoids
+    a Python call per check per record: composing one closure per check
+    measured slower than the original search loop on several filter sets
+    (see benchmarks/bench_query.py).
+    """
+    has_name, has_category, has_min, has_max = shape
+    # Cheapest checks first, so most sweets are rejected before the name is
+    # lowercased
+    checks = []
+    if has_category:
+        checks.append("s.category == category")
+    if has_min and has_max:
+        checks.append("min_price <= s.price <= max_price")
+    elif has_min:
+        checks.append("s.price >= min_price")
+    elif has_max:
+        checks.append("s.price <= max_price")
+    if has_name:
+        checks.append("needle in s.name.lower()")
+    condition = " and ".join(checks) or "True"
+
+    source = (
+        "def bind(needle, category, min_price, max_price):\n"
+        "    def matches(s):\n"
+        f"        return {condition}\n"
+        "    def select(sweets):\n"
+        f"        return [s for s in sweets if {condition}]\n"
+        "    return matches, select\n"
+    )
+    namespace = {}
+    exec(compile(source, f"<query {condition}>", "exec"), namespace)
+    return namespace["bind"]
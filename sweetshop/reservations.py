@@ -0,0 +1,125 @@
+class Reservation:
+    """Represents a temporary hold on stock of a sweet (e.g. an online cart)"""
+
+    __slots__ = ("id", "sweet_id", "quantity", "expires_at")
+
+    def __init__(self, id: int, sweet_id: int, quantity: int, expires_at: float):
+        """
+        Initialize a Reservation instance.
+
+        Args:
+            id: Unique identifier for the reservation
+            sweet_id: ID of the sweet being held
+            quantity: Number of items held
+            expires_at: Clock time at which the hold lapses
+        """
+        self.id = id
+        self.sweet_id = sweet_id
+        self.quantity = quantity
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return (f"Reservation(id={self.id}, sweet_id={self.sweet_id}, "
+                f"quantity={self.quantity}, expires_at={self.expires_at})")
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel used to expire reservations.
+
+    Deadlines are hashed into a fixed ring of slots, each covering ``tick``
+    seconds. Advancing the wheel only visits the slots whose ticks have
+    elapsed, so scheduling, cancelling and expiring are amortized O(1)
+    regardless of how many keys are outstanding. Keys whose deadline lies
+    more than one rotation ahead simply stay in their slot until a later lap.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, start: float = 0.0):
+        """
+        Initialize an empty wheel.
+
+        Args:
+            tick: Width of one slot in clock seconds
+            slots: Number of slots in the ring
+            start: Clock time the wheel starts at
+
+        Raises:
+            ValueError: If tick or slots is not positive
+        """
+        if tick <= 0 or slots <= 0:
+            raise ValueError("Tick and slots must be positive.")
+
+        self.tick = tick
+        self._slots = [{} for _ in range(slots)]
+        self._slot_of = {}
+        # Tick of the oldest slot that may still hold due keys
+        self._next_tick = int(start // tick)
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def __contains__(self, key):
+        return key in self._slot_of
+
+    def schedule(self, key, deadline: float):
+        """
+        Schedule (or reschedule) a key to expire at the given deadline.
+
+        Args:
+            key: Hashable key to expire
+            deadline: Clock time at which the key becomes due
+        """
+        self.cancel(key)
+        tick = max(int(deadline // self.tick), self._next_tick)
+        index = tick % len(self._slots)
+        self._slots[index][key] = deadline
+        self._slot_of[key] = index
+
+    def cancel(self, key) -> bool:
+        """
+        Remove a key from the wheel.
+
+        Returns:
+            True if the key was scheduled, False otherwise
+        """
+        index = self._slot_of.pop(key, None)
+        if index is None:
+            return False
+        del self._slots[index][key]
+        return True
+
+    def advance(self, now: float) -> list:
+        """
+        Move the wheel forward to ``now`` and collect every key that is due.
+
+        Args:
+            now: Current clock time
+
+        Returns:
+            List of keys whose deadline is at or before ``now``
+        """
+        now_tick = int(now // self.tick)
+        if now_tick < self._next_tick:
+            return []
+
+        slot_count = len(self._slots)
+        if now_tick - self._next_tick >= slot_count:
+            # A full lap (or more) has passed; every slot is a candidate
+            indexes = range(slot_count)
+        else:
+            indexes = (t % slot_count for t in range(self._next_tick, now_tick + 1))
+
+        expired = []
+        for index in indexes:
+            slot = self._slots[index]
+            if not slot:
+                continue
+            due = [key for key, deadline in slot.items() if deadline <= now]
+            for key in due:
+                del slot[key]
+                del self._slot_of[key]
+            expired.extend(due)
+
+        # The current tick may still hold keys due later within this tick
+        self._next_tick = now_tick
+        return expired
@@ -0,0 +1,76 @@
+from typing import Iterator, List
+from sweetshop import filters
+from sweetshop.models import SweetRecord
+
+
+class InventorySnapshot:
+    """
+    Read-only, point-in-time view of an Inventory.
+
+    A snapshot shares the inventory's sweet list instead of copying it; the
+    inventory copies the list only if it is structurally changed while a
+    snapshot is alive. Field changes made after the snapshot are undone on
+    read from the per-sweet version history the inventory keeps for live
+    snapshots, so readers always see the values as of ``seq`` and never
+    block writers.
+    """
+
+    def __init__(self, sweets: list, seq: int, history: dict):
+        """
+        Initialize a snapshot.
+
+        Args:
+            sweets: The inventory's sweet list at snapshot time (shared)
+            seq: Change-feed sequence number the snapshot reflects
+            history: Inventory version history, keyed by id() of each sweet,
+                     holding (valid_until_seq, SweetRecord) pairs in order
+        """
+        self.seq = seq
+        self._sweets = sweets
+        self._history = history
+
+    def __len__(self):
+        return len(self._sweets)
+
+    def __iter__(self) -> Iterator[SweetRecord]:
+        seq = self.seq
+        history = self._history
+        for sweet in self._sweets:
+            # Read the live fields before the history: writers record the
+            # old state before they mutate, so a change racing with this read
+            # is always caught by the history lookup.
+            record = SweetRecord.from_sweet(sweet)
+            versions = history.get(id(sweet))
+            if versions:
+                for valid_until, old_record in versions:
+                    if valid_until > seq:
+                        record = old_record
+                        break
+            yield record
+
+    def view_all_sweets(self) -> List[SweetRecord]:
+        """
+        Return every sweet as it was when the snapshot was taken.
+
+        Returns:
+            list: SweetRecord objects in inventory order
+        """
+        return list(self)
+
+    def search_sweets(self, name=None, category=None, min_price=None, max_price=None) -> List[SweetRecord]:
+        """
+        Search the snapshot; same filters as Inventory.search_sweets().
+
+        Raises:
+            ValueError: If min_price > max_price
+        """
+        return filters.search_sweets(self, name, category, min_price, max_price)
+
+    def sort_sweets(self, key: str, reverse: bool = False) -> List[SweetRecord]:
+        """
+        Sort the snapshot; same keys as Inventory.sort_sweets().
+
+        Raises:
+            ValueError: If key is not one of the supported sort keys
+        """
+        return filters.sort_sweets(self, key, reverse)
@@ -0,0 +1,200 @@
+import bisect
+import time
+from typing import List
+
+# Rescale decayed scores before the growth factor overflows a float
+_MAX_EXPONENT = 512
+
+
+class _Node:
+    """One character position in the trie"""
+
+    __slots__ = ("children", "ids", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.ids = set()
+        # Ranks (see AutocompleteTrie._rank) of the best sweets anywhere
+        # below this node, best first
+        self.top = []
+
+
+class AutocompleteTrie:
+    """
+    Prefix trie over sweet names that returns popularity-ranked completions.
+
+    Every node caches the top ``capacity`` sweet IDs of its subtree, so a
+    lookup costs O(len(prefix) + k) no matter how large the catalog is.
+    Popularity is an exponentially decayed purchase count with the given
+    half-life; rather than decaying every score over time, new purchases are
+    weighted up by the elapsed time, which keeps the ordering identical while
+    only touching the purchased sweet's path.
+
+    Nodes cache rank tuples rather than IDs, and a sweet's rank is one
+    shared tuple rebuilt only when its score changes, so re-ranking after a
+    purchase is a bisect per node with no sort keys derived on the way.
+    """
+
+    def __init__(self, capacity: int = 10, half_life: float = 7 * 24 * 3600, clock=None):
+        """
+        Initialize an empty trie.
+
+        Args:
+            capacity: Number of completions cached per node
+            half_life: Seconds after which a purchase counts half as much
+            clock: Zero-argument callable returning the current time
+
+        Raises:
+            ValueError: If capacity or half_life is not positive
+        """
+        if capacity <= 0 or half_life <= 0:
+            raise ValueError("Capacity and half-life must be positive.")
+
+        self.capacity = capacity
+        self.half_life = half_life
+        self._clock = clock or time.time
+        self._epoch = self._clock()
+        self._root = _Node()
+        self._names = {}
+        self._scores = {}
+        self._ranks = {}
+
+    def __len__(self):
+        return len(self._names)
+
+    def insert(self, sweet_id: int, name: str):
+        """Index a sweet under its name with no popularity yet"""
+        key = name.lower()
+        self._names[sweet_id] = key
+        self._scores[sweet_id] = 0.0
+        rank = self._ranks[sweet_id] = self._rank(sweet_id)
+
+        node = self._root
+        self._offer(node, rank)
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            self._offer(node, rank)
+        node.ids.add(sweet_id)
+
+    def remove(self, sweet_id: int):
+        """Drop a sweet from the index (no-op if it is not indexed)"""
+        key = self._names.get(sweet_id)
+        if key is None:
+            return
+
+        path = [self._root]
+        for char in key:
+            path.append(path[-1].children[char])
+        path[-1].ids.discard(sweet_id)
+        rank = self._ranks.pop(sweet_id)
+        del self._names[sweet_id]
+        del self._scores[sweet_id]
+
+        # Repair cached rankings bottom-up and prune nodes left empty
+        for depth in range(len(key), -1, -1):
+            node = path[depth]
+            if depth and not node.ids and not node.children:
+                del path[depth - 1].children[key[depth - 1]]
+                continue
+            if rank in node.top:
+                self._rebuild(node)
+
+    def record_purchase(self, sweet_id: int, quantity: int):
+        """Raise a sweet's popularity by a purchase of the given quantity"""
+        key = self._names.get(sweet_id)
+        if key is None:
+            return
+
+        exponent = (self._clock() - self._epoch) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            self._rebase()
+            exponent = (self._clock() - self._epoch) / self.half_life
+        self._scores[sweet_id] += quantity * 2.0 ** exponent
+        old_rank = self._ranks[sweet_id]
+        rank = self._ranks[sweet_id] = self._rank(sweet_id)
+
+        # Scores only grow here, so each cached ranking can be patched in
+        # place: the new rank sorts no later than the old one
+        node = self._root
+        self._promote(node, old_rank, rank)
+        for char in key:
+            node = node.children[char]
+            self._promote(node, old_rank, rank)
+
+    def complete(self, prefix: str, k: int = 5) -> List[int]:
+        """
+        Return the IDs of the k most popular sweets whose name starts with prefix.
+
+        Ties are broken alphabetically by name. Asking for more than
+        ``capacity`` results falls back to walking the whole subtree.
+        """
+        if k <= 0:
+            return []
+
+        node = self._root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        if k <= self.capacity:
+            return [rank[2] for rank in node.top[:k]]
+
+        ids = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            ids.extend(current.ids)
+            stack.extend(current.children.values())
+        ids.sort(key=self._ranks.__getitem__)
+        return ids[:k]
+
+    def _rank(self, sweet_id: int):
+        """Sort key: most popular first, then by name and ID"""
+        return (-self._scores[sweet_id], self._names[sweet_id], sweet_id)
+
+    def _offer(self, node: _Node, rank: tuple):
+        """Insert a rank into a node's ranking if it makes the cut"""
+        top = node.top
+        if len(top) >= self.capacity:
+            if rank >= top[-1]:
+                return
+            top.pop()
+        bisect.insort(top, rank)
+
+    def _promote(self, node: _Node, old_rank: tuple, rank: tuple):
+        """Replace a sweet's rank in a node's ranking after its score increased"""
+        top = node.top
+        index = bisect.bisect_left(top, old_rank)
+        if index < len(top) and top[index] is old_rank:
+            del top[index]
+            bisect.insort(top, rank, 0, index)
+        elif len(top) < self.capacity:
+            bisect.insort(top, rank)
+        elif rank < top[-1]:
+            top.pop()
+            bisect.insort(top, rank)
+
+    def _rebuild(self, node: _Node):
+        """Recompute a node's ranking from its own IDs and its children's"""
+        candidates = {self._ranks[sweet_id] for sweet_id in node.ids}
+        for child in node.children.values():
+            candidates.update(child.top)
+        node.top = sorted(candidates)[:self.capacity]
+
+    def _rebase(self):
+        """Move the decay epoch to now and rescale every score to match"""
+        now = self._clock()
+        factor = 2.0 ** (-(now - self._epoch) / self.half_life)
+        for sweet_id in self._scores:
+            self._scores[sweet_id] *= factor
+            self._ranks[sweet_id] = self._rank(sweet_id)
+        self._epoch = now
+
+        # Every cached rank holds the old score; scaling keeps the order,
+        # but equal scaled scores may now tie, so each ranking is re-sorted
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.top = sorted(self._ranks[rank[2]] for rank in node.top)
+            stack.extend(node.children.values())
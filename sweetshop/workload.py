@@ -0,0 +1,298 @@
+import bisect
+import itertools
+import random
+import threading
+import time
+from typing import Dict, List, NamedTuple
+from sweetshop.models import Sweet
+
+# Catalog vocabulary modelled on the README sample data
+CATEGORIES = {
+    "Nut-Based": ["Kaju", "Badam", "Pista", "Anjeer", "Akhrot"],
+    "Milk-Based": ["Gulab", "Rasgulla", "Kalakand", "Peda", "Rasmalai", "Barfi"],
+    "Vegetable": ["Gajar", "Lauki", "Beetroot", "Kaddu"],
+    "Flour-Based": ["Besan", "Motichoor", "Boondi", "Atta"],
+    "Fried": ["Jalebi", "Imarti", "Balushahi", "Malpua"],
+    "Chocolate": ["Dark", "Milk", "Hazelnut", "Truffle"],
+}
+STYLES = ["Katli", "Halwa", "Jamun", "Ladoo", "Roll", "Barfi", "Sandesh", "Bites", "Delight"]
+
+OPERATION_KINDS = ("search", "sort", "purchase", "restock", "add", "delete")
+DEFAULT_MIX = {"search": 0.30, "sort": 0.05, "purchase": 0.45, "restock": 0.10, "add": 0.05, "delete": 0.05}
+
+
+class Operation(NamedTuple):
+    """One inventory call in a workload: its kind and keyword arguments"""
+
+    kind: str
+    args: dict
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** skew"""
+
+    def __init__(self, n: int, skew: float, rng: random.Random):
+        """
+        Initialize a sampler.
+
+        Args:
+            n: Number of ranks
+            skew: Zipf exponent; 0 is uniform, ~1 is typical retail traffic
+            rng: Random source
+        """
+        self._cumulative = list(itertools.accumulate(1.0 / rank ** skew for rank in range(1, n + 1)))
+        self._total = self._cumulative[-1]
+        self._rng = rng
+
+    def sample(self) -> int:
+        """Return a rank, 0 being the most popular"""
+        return bisect.bisect_left(self._cumulative, self._rng.random() * self._total)
+
+
+def generate_catalog(count: int, seed: int = None, first_id: int = 1) -> List[Sweet]:
+    """
+    Create a synthetic catalog of sweets.
+
+    Names combine a base ingredient with a style (e.g. "Kaju Katli"), prices
+    follow a log-normal spread around the sample data's 10-50 range, and
+    quantities are uniform in 0-100.
+
+    Args:
+        count: Number of sweets
+        seed: Seed for reproducible catalogs
+        first_id: ID of the first sweet; the rest are consecutive
+
+    Returns:
+        List of new Sweet objects
+    """
+    rng = random.Random(seed)
+    return [Sweet(**_sweet_fields(rng, sweet_id)) for sweet_id in range(first_id, first_id + count)]
+
+
+def generate_operations(catalog: List[Sweet], count: int, mix: Dict[str, float] = None,
+                        skew: float = 1.1, seed: int = None) -> List[Operation]:
+    """
+    Create a stream of inventory operations against a catalog.
+
+    Purchases and restocks pick sweets with Zipf-skewed popularity (catalog
+    order is popularity order); deletes pick uniformly among sweets still in
+    the catalog and adds introduce new IDs after the largest catalog ID.
+    Operations on sweets deleted earlier in the stream are kept, since
+    real clients race with deletions too.
+
+    Args:
+        catalog: Sweets the target inventory starts with
+        count: Number of operations
+        mix: Relative weight per operation kind; defaults to DEFAULT_MIX
+        skew: Zipf exponent for key popularity
+        seed: Seed for reproducible streams
+
+    Returns:
+        List of Operation tuples
+
+    Raises:
+        ValueError: If the catalog is empty or mix names an unknown kind
+    """
+    if not catalog:
+        raise ValueError("Catalog cannot be empty.")
+
+    mix = DEFAULT_MIX if mix is None else mix
+    unknown = set(mix) - set(OPERATION_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown operation kind(s): {', '.join(sorted(unknown))}")
+
+    rng = random.Random(seed)
+    kinds = list(mix)
+    kind_weights = list(itertools.accumulate(mix[kind] for kind in kinds))
+    popularity = ZipfSampler(len(catalog), skew, rng)
+    live_ids = [sweet.id for sweet in catalog]
+    next_id = max(live_ids) + 1
+    words = sorted({word for sweet in catalog for word in sweet.name.split()})
+
+    operations = []
+    for _ in range(count):
+        kind = kinds[bisect.bisect_left(kind_weights, rng.random() * kind_weights[-1])]
+        if kind == "search":
+            args = _search_args(rng, words)
+        elif kind == "sort":
+            args = {"key": rng.choice(("name", "category", "price")), "reverse": rng.random() < 0.5}
+        elif kind == "purchase":
+            args = {"sweet_id": catalog[popularity.sample()].id, "quantity": rng.randint(1, 3)}
+        elif kind == "restock":
+            args = {"sweet_id": catalog[popularity.sample()].id, "quantity": rng.randint(10, 50)}
+        elif kind == "add":
+            args = _sweet_fields(rng, next_id)
+            live_ids.append(next_id)
+            next_id += 1
+        else:
+            if not live_ids:
+                continue
+            index = rng.randrange(len(live_ids))
+            live_ids[index], live_ids[-1] = live_ids[-1], live_ids[index]
+            args = {"sweet_id": live_ids.pop()}
+        operations.append(Operation(kind, args))
+    return operations
+
+
+class OperationStats:
+    """Latency and error counts for one operation kind"""
+
+    def __init__(self, kind: str, latencies: List[float], errors: int):
+        """
+        Initialize from raw measurements.
+
+        Args:
+            kind: Operation kind
+            latencies: Per-call latencies in seconds
+            errors: Calls that raised KeyError or ValueError
+        """
+        self.kind = kind
+        self.count = len(latencies)
+        self.errors = errors
+        ordered = sorted(latencies)
+        self.mean = sum(ordered) / len(ordered) if ordered else 0.0
+        self.p50 = _percentile(ordered, 50)
+        self.p90 = _percentile(ordered, 90)
+        self.p99 = _percentile(ordered, 99)
+        self.max = ordered[-1] if ordered else 0.0
+
+
+class ReplayReport:
+    """Outcome of replaying a workload: throughput and per-kind latencies"""
+
+    def __init__(self, elapsed: float, threads: int, stats: Dict[str, OperationStats]):
+        """
+        Initialize a report.
+
+        Args:
+            elapsed: Wall-clock seconds from first to last operation
+            threads: Number of threads used
+            stats: OperationStats per operation kind that occurred
+        """
+        self.elapsed = elapsed
+        self.threads = threads
+        self.stats = stats
+        self.operations = sum(s.count for s in stats.values())
+
+    @property
+    def throughput(self) -> float:
+        """Operations per second over the whole replay"""
+        return self.operations / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        """Render the report as a text table (latencies in microseconds)"""
+        lines = [
+            f"{self.operations:,} ops in {self.elapsed:.3f}s on {self.threads} thread(s): "
+            f"{self.throughput:,.0f} ops/s",
+            f"{'Operation':<10} {'Count':>9} {'Errors':>7} {'Mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'Max':>10}",
+        ]
+        for kind in OPERATION_KINDS:
+            s = self.stats.get(kind)
+            if s is None:
+                continue
+            lines.append(
+                f"{kind:<10} {s.count:>9,} {s.errors:>7,} {s.mean * 1e6:>9.1f} {s.p50 * 1e6:>9.1f} "
+                f"{s.p90 * 1e6:>9.1f} {s.p99 * 1e6:>9.1f} {s.max * 1e6:>10.1f}")
+        return "\n".join(lines)
+
+
+def replay(inventory, operations: List[Operation], threads: int = 1) -> ReplayReport:
+    """
+    Drive a workload against an inventory and measure it.
+
+    Any object with the Inventory methods (search_sweets, sort_sweets,
+    purchase_sweet, restock_sweet, add_sweet, delete_sweet) can be used.
+    KeyError and ValueError are counted as expected errors.
+
+    Args:
+        inventory: Inventory (or compatible implementation) to drive
+        operations: Stream from generate_operations()
+        threads: Number of threads; operations are dealt round-robin
+
+    Returns:
+        ReplayReport with throughput and per-kind latency distribution
+
+    Raises:
+        ValueError: If threads is not positive
+    """
+    if threads <= 0:
+        raise ValueError("Threads must be positive.")
+
+    calls = {
+        "search": lambda args: inventory.search_sweets(**args),
+        "sort": lambda args: inventory.sort_sweets(**args),
+        "purchase": lambda args: inventory.purchase_sweet(**args),
+        "restock": lambda args: inventory.restock_sweet(**args),
+        "add": lambda args: inventory.add_sweet(Sweet(**args)),
+        "delete": lambda args: inventory.delete_sweet(**args),
+    }
+    results = [None] * threads
+    failures = []
+    start_barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        latencies = {kind: [] for kind in OPERATION_KINDS}
+        errors = dict.fromkeys(OPERATION_KINDS, 0)
+        clock = time.perf_counter
+        start_barrier.wait()
+        try:
+            for kind, args in operations[index::threads]:
+                started = clock()
+                try:
+                    calls[kind](args)
+                except (KeyError, ValueError):
+                    errors[kind] += 1
+                latencies[kind].append(clock() - started)
+        except Exception as e:
+            failures.append(e)
+        results[index] = (latencies, errors)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise failures[0]
+
+    stats = {}
+    for kind in OPERATION_KINDS:
+        latencies = [value for result in results for value in result[0][kind]]
+        if latencies:
+            stats[kind] = OperationStats(kind, latencies, sum(result[1][kind] for result in results))
+    return ReplayReport(elapsed, threads, stats)
+
+
+def _sweet_fields(rng: random.Random, sweet_id: int) -> dict:
+    """Draw the fields of one synthetic sweet"""
+    category = rng.choice(list(CATEGORIES))
+    name = f"{rng.choice(CATEGORIES[category])} {rng.choice(STYLES)}"
+    price = round(min(max(rng.lognormvariate(3.0, 0.6), 1.0), 500.0), 2)
+    return {"id": sweet_id, "name": name, "category": category, "price": price,
+            "quantity": rng.randint(0, 100)}
+
+
+def _search_args(rng: random.Random, words: List[str]) -> dict:
+    """Draw a search filter: a name fragment, a category, a price band, or a mix"""
+    args = {}
+    if rng.random() < 0.6:
+        word = rng.choice(words)
+        args["name"] = word[:rng.randint(2, len(word))]
+    if rng.random() < 0.3:
+        args["category"] = rng.choice(list(CATEGORIES))
+    if rng.random() < 0.3:
+        low = round(rng.uniform(1, 40), 2)
+        args["min_price"] = low
+        args["max_price"] = round(low + rng.uniform(5, 40), 2)
+    return args
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, -(-len(ordered) * percent // 100) - 1))
+    return ordered[int(index)]
@@ -0,0 +1,11 @@
+class FakeClock:
+    """Manually advanced clock for deterministic time-dependent tests"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
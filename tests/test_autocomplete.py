@@ -0,0 +1,123 @@
+import random
+import unittest
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+from sweetshop.trie import AutocompleteTrie
+from fakes import FakeClock
+
+class TestAutocompleteTrie(unittest.TestCase):
+    """Test cases for the AutocompleteTrie index"""
+
+    def setUp(self):
+        """Set up a trie with a few names"""
+        self.clock = FakeClock(now=0.0)
+        self.trie = AutocompleteTrie(capacity=3, half_life=100.0, clock=self.clock)
+        for sweet_id, name in [(1, "Gulab Jamun"), (2, "Gajar Halwa"), (3, "Galaxy Bar"),
+                               (4, "Gummy Bears"), (5, "Kaju Katli")]:
+            self.trie.insert(sweet_id, name)
+
+    def test_prefix_without_purchases_is_alphabetical(self):
+        """Test unranked completions come back in name order"""
+        self.assertEqual(self.trie.complete("g", k=3), [2, 3, 1])
+        self.assertEqual(self.trie.complete("GA"), [2, 3])
+
+    def test_unknown_prefix(self):
+        """Test a prefix with no matches returns an empty list"""
+        self.assertEqual(self.trie.complete("xyz"), [])
+        self.assertEqual(self.trie.complete("g", k=0), [])
+
+    def test_purchases_rank_first(self):
+        """Test purchased sweets move ahead, even outside the cached top"""
+        self.trie.record_purchase(4, 2)
+        self.trie.record_purchase(1, 5)
+
+        self.assertEqual(self.trie.complete("g", k=3), [1, 4, 2])
+        self.assertEqual(self.trie.complete("gu"), [1, 4])
+
+    def test_recent_purchases_outweigh_old(self):
+        """Test older purchases decay against newer ones"""
+        self.trie.record_purchase(2, 10)
+        self.clock.now = 500.0
+        self.trie.record_purchase(3, 1)
+
+        self.assertEqual(self.trie.complete("ga"), [3, 2])
+
+    def test_remove_refills_ranking(self):
+        """Test removing a ranked sweet promotes the next best"""
+        self.trie.remove(2)
+
+        self.assertEqual(self.trie.complete("g", k=3), [3, 1, 4])
+        self.assertEqual(self.trie.complete("gaj"), [])
+        self.assertEqual(len(self.trie), 4)
+
+    def test_larger_k_than_capacity(self):
+        """Test k beyond the cached size walks the subtree"""
+        self.assertEqual(self.trie.complete("", k=10), [2, 3, 1, 4, 5])
+
+    def test_rebase_keeps_order(self):
+        """Test rescaling scores far in the future keeps the ranking"""
+        self.trie.record_purchase(1, 3)
+        self.trie.record_purchase(2, 1)
+        self.clock.now = 100.0 * 600
+        self.trie.record_purchase(4, 1)
+
+        self.assertEqual(self.trie.complete("g", k=3), [4, 1, 2])
+
+    def test_rankings_match_full_sort(self):
+        """Test cached rankings agree with sorting every match, after many updates"""
+        rng = random.Random(5)
+        names = {sweet_id: name for sweet_id, name in
+                 [(1, "Gulab Jamun"), (2, "Gajar Halwa"), (3, "Galaxy Bar"), (4, "Gummy Bears"), (5, "Kaju Katli")]}
+        for sweet_id in range(6, 60):
+            names[sweet_id] = "".join(rng.choice("gak") for _ in range(rng.randint(1, 4)))
+            self.trie.insert(sweet_id, names[sweet_id])
+        for _ in range(500):
+            sweet_id = rng.randrange(1, 60)
+            if rng.random() < 0.05 and sweet_id in self.trie._names:
+                self.trie.remove(sweet_id)
+                del names[sweet_id]
+            else:
+                self.trie.record_purchase(sweet_id, rng.randint(1, 3))
+            self.clock.now += rng.random()
+
+        for prefix in ["", "g", "ga", "k", "ka", "gak", "gu"]:
+            expected = sorted((sweet_id for sweet_id, name in names.items() if name.lower().startswith(prefix)),
+                              key=self.trie._rank)
+            self.assertEqual(self.trie.complete(prefix, k=3), expected[:3])
+
+class TestInventoryAutocomplete(unittest.TestCase):
+    """Test cases for Inventory.autocomplete()"""
+
+    def setUp(self):
+        """Set up test inventory with sample sweets"""
+        self.inventory = Inventory()
+        self.sweet1 = Sweet(id=1001, name="Kaju Katli", category="Nut-Based", price=50, quantity=20)
+        self.sweet2 = Sweet(id=1002, name="Kalakand", category="Milk-Based", price=40, quantity=30)
+        self.sweet3 = Sweet(id=1003, name="Gulab Jamun", category="Milk-Based", price=10, quantity=50)
+
+        for sweet in [self.sweet1, self.sweet2, self.sweet3]:
+            self.inventory.add_sweet(sweet)
+
+    def test_autocomplete_returns_sweets(self):
+        """Test suggestions are Sweet objects matching the prefix"""
+        self.assertEqual(self.inventory.autocomplete("ka"), [self.sweet1, self.sweet2])
+
+    def test_autocomplete_ranked_by_purchases(self):
+        """Test purchased sweets are suggested first"""
+        self.inventory.purchase_sweet(1002, 3)
+        self.assertEqual(self.inventory.autocomplete("ka", k=1), [self.sweet2])
+
+    def test_committed_reservation_counts_as_purchase(self):
+        """Test committed cart holds raise popularity"""
+        reservation = self.inventory.reserve(1002, 2, ttl=60)
+        self.inventory.commit_reservation(reservation.id)
+        self.assertEqual(self.inventory.autocomplete("k")[0], self.sweet2)
+
+    def test_autocomplete_after_delete(self):
+        """Test deleted sweets are no longer suggested"""
+        self.inventory.delete_sweet(1001)
+        self.assertEqual(self.inventory.autocomplete("ka"), [self.sweet2])
+
+
+if __name__ == '__main__':
+    unittest.main()
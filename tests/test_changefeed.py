@@ -0,0 +1,196 @@
+import unittest
+from sweetshop import changefeed
+from sweetshop.changefeed import ChangeFeed, ResyncRequired
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+
+class TestChangeFeed(unittest.TestCase):
+    """Test cases for the ChangeFeed ring buffer"""
+
+    def test_sequence_numbers_increase(self):
+        """Test published events get consecutive sequence numbers"""
+        feed = ChangeFeed(capacity=4)
+        seqs = [feed.publish(changefeed.ADDED, i).seq for i in range(1, 4)]
+
+        self.assertEqual(seqs, [1, 2, 3])
+        self.assertEqual(feed.last_seq, 3)
+
+    def test_read_after_sequence(self):
+        """Test reading returns only events after the given seq"""
+        feed = ChangeFeed(capacity=8)
+        for i in range(1, 6):
+            feed.publish(changefeed.ADDED, i)
+
+        self.assertEqual([e.seq for e in feed.read(2)], [3, 4, 5])
+        self.assertEqual([e.seq for e in feed.read(2, limit=2)], [3, 4])
+        self.assertEqual(feed.read(5), [])
+
+    def test_ring_overwrites_oldest(self):
+        """Test the feed keeps only the newest capacity events"""
+        feed = ChangeFeed(capacity=3)
+        for i in range(1, 6):
+            feed.publish(changefeed.ADDED, i)
+
+        self.assertEqual(feed.oldest_seq, 3)
+        self.assertEqual([e.sweet_id for e in feed.read(2)], [3, 4, 5])
+
+    def test_lagging_consumer_must_resync(self):
+        """Test a consumer behind the retained window gets ResyncRequired"""
+        feed = ChangeFeed(capacity=3)
+        subscription = feed.subscribe()
+        for i in range(1, 6):
+            feed.publish(changefeed.ADDED, i)
+
+        with self.assertRaises(ResyncRequired):
+            subscription.poll()
+        with self.assertRaises(ResyncRequired):
+            feed.subscribe(after_seq=1)
+
+    def test_overwrite_during_read_must_resync(self):
+        """Test events overwritten while a read copies them are never returned"""
+        feed = ChangeFeed(capacity=4)
+        for i in range(1, 4):
+            feed.publish(changefeed.ADDED, i)
+        subscription = feed.subscribe(after_seq=0)
+
+        class RacingRing(list):
+            """Ring whose first lookup lets a writer lap the reader"""
+            raced = False
+
+            def __getitem__(self, index):
+                if not self.raced:
+                    self.raced = True
+                    for i in range(4, 8):
+                        feed.publish(changefeed.ADDED, i)
+                return super().__getitem__(index)
+
+        feed._ring = RacingRing(feed._ring)
+        with self.assertRaises(ResyncRequired):
+            subscription.poll()
+        self.assertEqual(subscription.position, 0)
+
+    def test_position_beyond_end_must_resync(self):
+        """Test a sequence number the feed has not reached is rejected"""
+        feed = ChangeFeed(capacity=4)
+        feed.publish(changefeed.ADDED, 1)
+
+        with self.assertRaises(ResyncRequired):
+            feed.subscribe(after_seq=2)
+        with self.assertRaises(ResyncRequired):
+            feed.read(5)
+        self.assertEqual(feed.subscribe(after_seq=1).poll(), [])
+
+    def test_subscription_advances(self):
+        """Test polling moves the subscription forward"""
+        feed = ChangeFeed(capacity=8)
+        subscription = feed.subscribe()
+        feed.publish(changefeed.ADDED, 1)
+        feed.publish(changefeed.ADDED, 2)
+
+        self.assertEqual(subscription.lag, 2)
+        self.assertEqual(len(subscription.poll()), 2)
+        self.assertEqual(subscription.lag, 0)
+        self.assertEqual(subscription.poll(), [])
+
+    def test_invalid_capacity(self):
+        """Test a non-positive capacity raises ValueError"""
+        with self.assertRaises(ValueError):
+            ChangeFeed(capacity=0)
+
+class TestInventoryChangeFeed(unittest.TestCase):
+    """Test cases for change events published by Inventory"""
+
+    def setUp(self):
+        """Set up inventory with a subscription opened before any change"""
+        self.inventory = Inventory()
+        self.subscription = self.inventory.changes.subscribe()
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50)
+        self.inventory.add_sweet(self.sweet1)
+
+    def test_add_event(self):
+        """Test adding a sweet publishes an ADDED event with its fields"""
+        [event] = self.subscription.poll()
+
+        self.assertEqual(event.kind, changefeed.ADDED)
+        self.assertEqual(event.sweet_id, 1)
+        self.assertEqual(event.new.name, "Chocolate Bar")
+        self.assertEqual(event.new.quantity, 50)
+
+    def test_quantity_events(self):
+        """Test purchase and restock publish QUANTITY_CHANGED events"""
+        self.subscription.poll()
+        self.inventory.purchase_sweet(1, 10)
+        self.inventory.restock_sweet(1, 5)
+
+        events = self.subscription.poll()
+        self.assertEqual([e.kind for e in events], [changefeed.QUANTITY_CHANGED] * 2)
+        self.assertEqual([(e.old, e.new) for e in events], [(50, 40), (40, 45)])
+
+    def test_commit_reservation_event(self):
+        """Test committing a reservation publishes the quantity change"""
+        self.subscription.poll()
+        reservation = self.inventory.reserve(1, 5, ttl=60)
+        self.inventory.commit_reservation(reservation.id)
+
+        [event] = self.subscription.poll()
+        self.assertEqual((event.kind, event.old, event.new), (changefeed.QUANTITY_CHANGED, 50, 45))
+
+    def test_price_event(self):
+        """Test update_price publishes a PRICE_CHANGED event"""
+        self.subscription.poll()
+        self.inventory.update_price(1, 3.49)
+
+        [event] = self.subscription.poll()
+        self.assertEqual(event.kind, changefeed.PRICE_CHANGED)
+        self.assertEqual((event.old, event.new), (2.99, 3.49))
+        self.assertEqual(self.sweet1.price, 3.49)
+
+    def test_update_price_validation(self):
+        """Test update_price rejects bad prices and unknown IDs"""
+        with self.assertRaises(ValueError):
+            self.inventory.update_price(1, 0)
+        with self.assertRaises(KeyError):
+            self.inventory.update_price(999, 1.00)
+
+    def test_delete_event(self):
+        """Test deleting a sweet publishes a DELETED event"""
+        self.subscription.poll()
+        self.inventory.delete_sweet(1)
+
+        [event] = self.subscription.poll()
+        self.assertEqual(event.kind, changefeed.DELETED)
+        self.assertEqual(event.old.name, "Chocolate Bar")
+
+    def test_failed_mutation_publishes_nothing(self):
+        """Test rejected operations leave the feed untouched"""
+        self.subscription.poll()
+        with self.assertRaises(ValueError):
+            self.inventory.purchase_sweet(1, 500)
+
+        self.assertEqual(self.subscription.poll(), [])
+
+    def test_replica_stays_in_sync(self):
+        """Test a replica built from the feed matches the inventory"""
+        replica = {}
+        for i in range(2, 6):
+            self.inventory.add_sweet(Sweet(id=i, name=f"Sweet {i}", category="Candy", price=1.0, quantity=10))
+        self.inventory.purchase_sweet(2, 3)
+        self.inventory.update_price(3, 1.5)
+        self.inventory.delete_sweet(4)
+
+        for event in self.subscription.poll():
+            if event.kind == changefeed.ADDED:
+                replica[event.sweet_id] = event.new._asdict()
+            elif event.kind == changefeed.DELETED:
+                del replica[event.sweet_id]
+            elif event.kind == changefeed.QUANTITY_CHANGED:
+                replica[event.sweet_id]["quantity"] = event.new
+            elif event.kind == changefeed.PRICE_CHANGED:
+                replica[event.sweet_id]["price"] = event.new
+
+        expected = {s.id: (s.price, s.quantity) for s in self.inventory.view_all_sweets()}
+        self.assertEqual({i: (r["price"], r["quantity"]) for i, r in replica.items()}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
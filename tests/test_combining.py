@@ -0,0 +1,185 @@
+import threading
+import time
+import unittest
+from sweetshop.combining import WriteCombiner
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+
+class TestWriteCombiner(unittest.TestCase):
+    """Test cases for the WriteCombiner batching front end"""
+
+    def setUp(self):
+        """Set up test inventory with sample sweets"""
+        self.inventory = Inventory()
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=10)
+        self.sweet2 = Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.inventory.add_sweet(self.sweet1)
+        self.inventory.add_sweet(self.sweet2)
+        self.combiner = WriteCombiner(self.inventory, batch_size=1000)
+
+    def wait_until_done(self, future, timeout=5):
+        """Poll without flushing until the background flusher settles future"""
+        deadline = time.monotonic() + timeout
+        while not future.done() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertTrue(future.done())
+
+    def test_requests_wait_for_flush(self):
+        """Test nothing is applied before the batch is flushed"""
+        future = self.combiner.purchase_sweet(1, 3)
+
+        self.assertFalse(future.done())
+        self.assertEqual(self.sweet1.quantity, 10)
+
+        self.combiner.flush()
+        self.assertIsNone(future.result())
+        self.assertEqual(self.sweet1.quantity, 7)
+
+    def test_outcomes_in_arrival_order(self):
+        """Test each request is judged against stock left by earlier ones"""
+        futures = [self.combiner.purchase_sweet(1, 4) for _ in range(3)]
+        futures.append(self.combiner.restock_sweet(1, 5))
+        futures.append(self.combiner.purchase_sweet(1, 4))
+        self.combiner.flush()
+
+        self.assertIsNone(futures[0].result())
+        self.assertIsNone(futures[1].result())
+        with self.assertRaises(ValueError) as context:
+            futures[2].result()
+        self.assertEqual(str(context.exception), "Not enough stock.")
+        self.assertIsNone(futures[3].result())
+        self.assertIsNone(futures[4].result())
+        self.assertEqual(self.sweet1.quantity, 3)
+
+    def test_merged_into_one_update(self):
+        """Test a burst on one sweet publishes a single change event"""
+        subscription = self.inventory.changes.subscribe()
+        for _ in range(50):
+            self.combiner.purchase_sweet(2, 1)
+        self.combiner.restock_sweet(2, 10)
+        self.combiner.flush()
+
+        [event] = subscription.poll()
+        self.assertEqual((event.old, event.new), (100, 60))
+        self.assertEqual(len(self.inventory.ledger), 2)
+        self.assertEqual(self.inventory.ledger.units_sold(0, by="sweet"), {2: 50})
+
+    def test_invalid_requests(self):
+        """Test invalid quantities and unknown IDs fail like direct calls"""
+        with self.assertRaises(ValueError):
+            self.combiner.purchase_sweet(1, 0).result()
+        with self.assertRaises(ValueError):
+            self.combiner.restock_sweet(1, -1).result()
+
+        future = self.combiner.purchase_sweet(999, 1)
+        self.combiner.flush()
+        with self.assertRaises(KeyError):
+            future.result()
+
+    def test_batches_for_many_sweets(self):
+        """Test one call applies every sweet's batch and isolates unknown IDs"""
+        outcomes = self.inventory.apply_stock_batches({1: [-4, -10], 2: [5], 999: [-1]})
+
+        self.assertIsNone(outcomes[1][0])
+        self.assertIsInstance(outcomes[1][1], ValueError)
+        self.assertEqual(outcomes[2], [None])
+        self.assertIsInstance(outcomes[999][0], KeyError)
+        self.assertEqual((self.sweet1.quantity, self.sweet2.quantity), (6, 105))
+
+    def test_batch_size_triggers_flush(self):
+        """Test a full batch is applied without an explicit flush"""
+        combiner = WriteCombiner(self.inventory, batch_size=5)
+        futures = [combiner.purchase_sweet(2, 1) for _ in range(5)]
+
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(self.sweet2.quantity, 95)
+
+    def test_background_flush(self):
+        """Test the flush interval applies requests on its own"""
+        with WriteCombiner(self.inventory, flush_interval=0.01) as combiner:
+            self.wait_until_done(combiner.purchase_sweet(2, 5))
+        self.assertEqual(self.sweet2.quantity, 95)
+
+    def test_result_flushes_pending_request(self):
+        """Test asking for a queued request's outcome applies it instead of hanging"""
+        future = self.combiner.purchase_sweet(1, 3)
+
+        self.assertIsNone(future.result())
+        self.assertEqual(self.sweet1.quantity, 7)
+
+    def test_unhashable_id_fails_only_its_request(self):
+        """Test a bad sweet ID fails its own request and not the batch"""
+        good = self.combiner.purchase_sweet(1, 2)
+        bad = self.combiner.purchase_sweet([1], 2)
+        self.combiner.flush()
+
+        with self.assertRaises(TypeError):
+            bad.result()
+        self.assertIsNone(good.result())
+        self.assertEqual(self.sweet1.quantity, 8)
+
+    def test_failed_batch_resolves_every_request(self):
+        """Test an unexpected error while applying is delivered, not lost"""
+        def broken(batches):
+            raise RuntimeError("disk on fire")
+        self.inventory.apply_stock_batches = broken
+        futures = [self.combiner.purchase_sweet(1, 1), self.combiner.restock_sweet(2, 1)]
+        self.combiner.flush()
+
+        for future in futures:
+            self.assertTrue(future.done())
+            self.assertIsInstance(future.exception(), RuntimeError)
+
+    def test_background_flusher_survives_errors(self):
+        """Test interval flushing carries on after a failed batch"""
+        calls = []
+        apply = self.inventory.apply_stock_batches
+
+        def flaky(batches):
+            calls.append(batches)
+            if len(calls) == 1:
+                raise RuntimeError("transient")
+            return apply(batches)
+        self.inventory.apply_stock_batches = flaky
+
+        with WriteCombiner(self.inventory, flush_interval=0.01) as combiner:
+            first = combiner.purchase_sweet(2, 1)
+            self.wait_until_done(first)
+            second = combiner.purchase_sweet(2, 1)
+            self.wait_until_done(second)
+
+        self.assertIsInstance(first.exception(), RuntimeError)
+        self.assertIsNone(second.exception())
+        self.assertEqual(self.sweet2.quantity, 99)
+
+    def test_close_flushes_pending(self):
+        """Test closing applies outstanding requests"""
+        future = self.combiner.restock_sweet(1, 1)
+        self.combiner.close()
+
+        self.assertTrue(future.done())
+        self.assertEqual(self.sweet1.quantity, 11)
+
+    def test_concurrent_submitters_never_oversell(self):
+        """Test many threads buying the same sweet sell exactly the stock"""
+        combiner = WriteCombiner(self.inventory, batch_size=16)
+        results = []
+
+        def buyer():
+            futures = [combiner.purchase_sweet(2, 1) for _ in range(50)]
+            combiner.flush()
+            results.extend(f.exception() is None for f in futures)
+
+        threads = [threading.Thread(target=buyer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        combiner.close()
+
+        self.assertEqual(sum(results), 100)
+        self.assertEqual(self.sweet2.quantity, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
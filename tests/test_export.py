@@ -0,0 +1,95 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from sweetshop.export import export_sweets
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+
+class TestExportSweets(unittest.TestCase):
+    """Test cases for export.export_sweets()"""
+
+    def setUp(self):
+        """Set up test inventory with sample sweets"""
+        self.inventory = Inventory()
+        self.inventory.add_sweet(Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50))
+        self.inventory.add_sweet(Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100))
+        self.inventory.add_sweet(Sweet(id=3, name='Caramel "Chew", Salted', category="Caramel", price=2.49, quantity=40))
+
+    def test_csv_export(self):
+        """Test CSV output has a header and quotes awkward names"""
+        out = io.BytesIO()
+        written = export_sweets(self.inventory, out, "csv")
+
+        rows = list(csv.reader(io.StringIO(out.getvalue().decode("utf-8"))))
+        self.assertEqual(written, 3)
+        self.assertEqual(rows[0], ["id", "name", "category", "price", "quantity"])
+        self.assertEqual(rows[3], ["3", 'Caramel "Chew", Salted', "Caramel", "2.49", "40"])
+
+    def test_jsonl_export(self):
+        """Test each JSON line decodes to one sweet"""
+        out = io.BytesIO()
+        export_sweets(self.inventory, out, "jsonl")
+
+        records = [json.loads(line) for line in out.getvalue().decode("utf-8").splitlines()]
+        self.assertEqual(records[2], {"id": 3, "name": 'Caramel "Chew", Salted',
+                                      "category": "Caramel", "price": 2.49, "quantity": 40})
+
+    def test_filters_apply(self):
+        """Test search filters limit the exported rows"""
+        out = io.BytesIO()
+        written = export_sweets(self.inventory, out, "jsonl", name="bar", max_price=2.5)
+
+        self.assertEqual(written, 0)
+        written = export_sweets(self.inventory, out, "jsonl", min_price=2.0)
+        ids = [json.loads(line)["id"] for line in out.getvalue().splitlines()]
+        self.assertEqual((written, ids), (2, [1, 3]))
+
+    def test_gzip_to_file(self):
+        """Test compressed output round-trips through gzip"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweets.csv.gz")
+            export_sweets(self.inventory, path, "csv", compress=True)
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self.assertEqual(len(list(csv.reader(f))), 4)
+
+    def test_gzip_leaves_stream_open(self):
+        """Test compressing into a caller's stream does not close it"""
+        out = io.BytesIO()
+        export_sweets(self.inventory, out, "jsonl", compress=True)
+
+        self.assertFalse(out.closed)
+        self.assertEqual(len(gzip.decompress(out.getvalue()).splitlines()), 3)
+
+    def test_small_chunks(self):
+        """Test rows are not lost or repeated across chunk boundaries"""
+        out = io.BytesIO()
+        written = export_sweets(self.inventory, out, "csv", chunk_rows=2)
+
+        self.assertEqual(written, 3)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+
+    def test_export_is_consistent(self):
+        """Test the export reflects the inventory when it started"""
+        snapshot = self.inventory.snapshot()
+        self.inventory.purchase_sweet(1, 10)
+        out = io.BytesIO()
+        export_sweets(snapshot, out, "jsonl", name="Chocolate")
+
+        self.assertEqual(json.loads(out.getvalue())["quantity"], 50)
+
+    def test_invalid_arguments(self):
+        """Test unknown formats, bad chunk sizes and price ranges raise ValueError"""
+        with self.assertRaises(ValueError):
+            export_sweets(self.inventory, io.BytesIO(), "xml")
+        with self.assertRaises(ValueError):
+            export_sweets(self.inventory, io.BytesIO(), "csv", chunk_rows=0)
+        with self.assertRaises(ValueError):
+            export_sweets(self.inventory, io.BytesIO(), "csv", min_price=5, max_price=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+from sweetshop.idempotency import IdempotencyCache
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+from fakes import FakeClock
+
+class TestIdempotencyCache(unittest.TestCase):
+    """Test cases for the IdempotencyCache class"""
+
+    def setUp(self):
+        """Set up a small cache on a fake clock"""
+        self.clock = FakeClock()
+        self.cache = IdempotencyCache(capacity=3, ttl=60, clock=self.clock)
+
+    def test_put_and_get(self):
+        """Test a stored outcome is returned and replayed"""
+        self.cache.put("a", ("call",), result=42)
+
+        self.assertEqual(self.cache.get("a").replay(), 42)
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_stored_error_is_raised(self):
+        """Test replaying a failed call raises its error again"""
+        self.cache.put("a", ("call",), error=KeyError("Sweet not found."))
+
+        with self.assertRaises(KeyError):
+            self.cache.get("a").replay()
+
+    def test_stored_error_holds_no_traceback(self):
+        """Test a stored error keeps no frames alive, before or after replay"""
+        try:
+            raise ValueError("Not enough stock.")
+        except ValueError as e:
+            self.cache.put("a", ("call",), error=e)
+
+        outcome = self.cache.get("a")
+        self.assertIsNone(outcome.error.__traceback__)
+        with self.assertRaisesRegex(ValueError, "Not enough stock"):
+            outcome.replay()
+        self.assertIsNone(outcome.error.__traceback__)
+
+    def test_ttl_expiry(self):
+        """Test outcomes are forgotten once their TTL has passed"""
+        self.cache.put("a", ("call",), result=1)
+        self.clock.advance(59)
+        self.assertIsNotNone(self.cache.get("a"))
+
+        self.clock.advance(1)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        """Test the least recently used key is dropped when full"""
+        for key in "abc":
+            self.cache.put(key, (key,), result=key)
+        self.cache.get("a")
+        self.cache.put("d", ("d",), result="d")
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def test_expired_keys_are_purged_on_put(self):
+        """Test stale keys do not occupy memory until they are looked up"""
+        self.cache.put("a", ("a",), result=1)
+        self.cache.put("b", ("b",), result=2)
+        self.clock.advance(120)
+        self.cache.put("c", ("c",), result=3)
+
+        self.assertEqual(len(self.cache), 1)
+
+    def test_invalid_arguments(self):
+        """Test non-positive capacity or TTL raises ValueError"""
+        with self.assertRaises(ValueError):
+            IdempotencyCache(capacity=0)
+        with self.assertRaises(ValueError):
+            IdempotencyCache(ttl=0)
+
+class TestInventoryIdempotency(unittest.TestCase):
+    """Test cases for idempotency keys on Inventory mutations"""
+
+    def setUp(self):
+        """Set up test inventory with a sample sweet"""
+        self.clock = FakeClock()
+        self.inventory = Inventory(clock=self.clock, idempotency_ttl=60)
+        self.inventory.add_sweet(Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50))
+
+    def test_retried_purchase_applies_once(self):
+        """Test a purchase retried with the same key is not repeated"""
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-1")
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-1")
+        self.inventory.purchase_sweet(sweet_id=1, quantity=5, idempotency_key="order-1")
+
+        self.assertEqual(self.inventory.sweets[0].quantity, 45)
+        self.assertEqual(self.inventory.ledger.units_sold(0), {"Chocolate": 5})
+
+    def test_retried_restock_applies_once(self):
+        """Test a restock retried with the same key is not repeated"""
+        for _ in range(3):
+            self.inventory.restock_sweet(1, 10, idempotency_key="delivery-7")
+
+        self.assertEqual(self.inventory.sweets[0].quantity, 60)
+
+    def test_different_keys_apply_separately(self):
+        """Test distinct keys and unkeyed calls are all applied"""
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-1")
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-2")
+        self.inventory.purchase_sweet(1, 5)
+
+        self.assertEqual(self.inventory.sweets[0].quantity, 35)
+
+    def test_error_is_replayed(self):
+        """Test a failed call's error is raised again, even if it would now succeed"""
+        with self.assertRaises(ValueError):
+            self.inventory.purchase_sweet(1, 80, idempotency_key="order-1")
+        self.inventory.restock_sweet(1, 100)
+
+        with self.assertRaises(ValueError):
+            self.inventory.purchase_sweet(1, 80, idempotency_key="order-1")
+        self.assertEqual(self.inventory.sweets[0].quantity, 150)
+
+    def test_result_is_replayed(self):
+        """Test a retried reserve() returns the original reservation"""
+        first = self.inventory.reserve(1, 5, ttl=30, idempotency_key="cart-1")
+        second = self.inventory.reserve(1, 5, ttl=30, idempotency_key="cart-1")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.inventory.available_quantity(1), 45)
+
+    def test_retried_add_with_equal_sweet(self):
+        """Test re-sending an equal Sweet object counts as the same call"""
+        sweet = dict(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.inventory.add_sweet(Sweet(**sweet), idempotency_key="add-2")
+        self.inventory.add_sweet(Sweet(**sweet), idempotency_key="add-2")
+
+        self.assertEqual(len(self.inventory.sweets), 2)
+
+    def test_retried_add_after_sweet_changed(self):
+        """Test retrying add_sweet() with the stored, since mutated, object replays"""
+        sweet = Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.inventory.add_sweet(sweet, idempotency_key="add-2")
+        self.inventory.purchase_sweet(2, 2)
+        self.inventory.add_sweet(sweet, idempotency_key="add-2")
+
+        self.assertEqual(len(self.inventory.sweets), 2)
+        self.assertEqual(sweet.quantity, 98)
+
+    def test_fingerprint_does_not_hold_caller_objects(self):
+        """Test mutating a dict after a keyed call neither leaks into nor breaks replay"""
+        batches = {1: [-5, 10]}
+        first = self.inventory.apply_stock_batches(batches, idempotency_key="flush-1")
+        outcome = self.inventory._idempotency.get("flush-1")
+        self.assertFalse(any(value is batches for value in outcome.fingerprint))
+
+        batches[1].append(-1)
+        with self.assertRaises(ValueError):
+            self.inventory.apply_stock_batches(batches, idempotency_key="flush-1")
+        self.assertEqual(self.inventory.apply_stock_batches({1: [-5, 10]}, idempotency_key="flush-1"), first)
+        self.assertEqual(self.inventory.sweets[0].quantity, 55)
+
+    def test_key_reused_for_different_call(self):
+        """Test reusing a key with other arguments raises ValueError"""
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-1")
+
+        with self.assertRaises(ValueError):
+            self.inventory.purchase_sweet(1, 6, idempotency_key="order-1")
+        with self.assertRaises(ValueError):
+            self.inventory.restock_sweet(1, 5, idempotency_key="order-1")
+        self.assertEqual(self.inventory.sweets[0].quantity, 45)
+
+    def test_key_expires(self):
+        """Test a key can be used again once its TTL has passed"""
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-1")
+        self.clock.advance(60)
+        self.inventory.purchase_sweet(1, 5, idempotency_key="order-1")
+
+        self.assertEqual(self.inventory.sweets[0].quantity, 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
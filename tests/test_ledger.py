@@ -0,0 +1,153 @@
+import unittest
+from sweetshop import ledger
+from sweetshop.inventory import Inventory
+from sweetshop.ledger import SalesLedger, _cover
+from sweetshop.models import Sweet
+from fakes import FakeClock
+
+DAY = 86400
+
+class TestSalesLedger(unittest.TestCase):
+    """Test cases for the SalesLedger rollups"""
+
+    def setUp(self):
+        """Set up a ledger with a fake clock"""
+        self.clock = FakeClock(now=100 * DAY)
+        self.ledger = SalesLedger(clock=self.clock)
+
+    def test_record_and_entries(self):
+        """Test events are stored and read back in order"""
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 3, timestamp=10.0)
+        self.ledger.record(ledger.RESTOCK, 2, "Gummies", 20, timestamp=11.0)
+
+        entries = list(self.ledger.entries())
+        self.assertEqual(len(self.ledger), 2)
+        self.assertEqual(entries[0], (10.0, ledger.PURCHASE, 1, "Chocolate", 3))
+        self.assertEqual(entries[1].category, "Gummies")
+
+    def test_units_sold_by_category_and_sweet(self):
+        """Test windowed totals grouped both ways"""
+        now = self.clock.now
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 3, timestamp=now - 2 * DAY)
+        self.ledger.record(ledger.PURCHASE, 2, "Chocolate", 4, timestamp=now - 3600)
+        self.ledger.record(ledger.PURCHASE, 3, "Gummies", 5, timestamp=now - 30)
+        self.ledger.record(ledger.RESTOCK, 3, "Gummies", 50, timestamp=now - 30)
+
+        self.assertEqual(self.ledger.units_sold(now - 7 * DAY), {"Chocolate": 7, "Gummies": 5})
+        self.assertEqual(self.ledger.units_sold(now - 7 * DAY, by="sweet"), {1: 3, 2: 4, 3: 5})
+        self.assertEqual(self.ledger.units_restocked(now - DAY), {"Gummies": 50})
+
+    def test_window_excludes_older_events(self):
+        """Test events outside the window are not counted"""
+        now = self.clock.now
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 3, timestamp=now - 8 * DAY)
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 2, timestamp=now - DAY)
+
+        self.assertEqual(self.ledger.units_sold(now - 7 * DAY), {"Chocolate": 2})
+        self.assertEqual(self.ledger.units_sold(now - 9 * DAY, now - 7 * DAY), {"Chocolate": 3})
+
+    def test_rollups_match_raw_events(self):
+        """Test rollup answers equal a scan over random windows"""
+        ledger_ = SalesLedger(clock=self.clock, minute_retention=20 * DAY)
+        events = [(i * 977.0 % (20 * DAY), i % 7, i % 3 + 1) for i in range(2000)]
+        for timestamp, sweet_id, quantity in events:
+            ledger_.record(ledger.PURCHASE, sweet_id, f"Cat {sweet_id % 2}", quantity, timestamp)
+
+        for start_min, end_min in [(0, 20 * 1440), (61, 1500), (1439, 1441), (3000, 17000)]:
+            expected = {}
+            for timestamp, sweet_id, quantity in events:
+                if start_min * 60 <= timestamp < end_min * 60:
+                    expected[sweet_id] = expected.get(sweet_id, 0) + quantity
+            self.assertEqual(ledger_.units_sold(start_min * 60, end_min * 60, by="sweet"), expected)
+
+    def test_minute_buckets_are_bounded(self):
+        """Test minute buckets are dropped once past their retention"""
+        ledger_ = SalesLedger(clock=self.clock, minute_retention=3600)
+        for minute in range(10 * 1440):
+            ledger_.record(ledger.PURCHASE, minute % 50, "Chocolate", 1, timestamp=minute * 60.0)
+
+        self.assertLessEqual(len(ledger_._rollups[1]), 2 * 60)
+        self.assertEqual(len(ledger_._rollups[60]), 10 * 24)
+        self.assertEqual(len(ledger_._rollups[1440]), 10)
+        self.assertEqual(ledger_.units_sold(0, 10 * DAY), {"Chocolate": 10 * 1440})
+        # Before the retention, edges are widened to whole hours
+        self.assertEqual(ledger_.units_sold(90 * 60, 2 * DAY + 30 * 60), {"Chocolate": 2 * 1440})
+        # Within it they stay minute-exact
+        self.assertEqual(ledger_.units_sold(10 * DAY - 30 * 60 - 1, 10 * DAY - 60 * 10), {"Chocolate": 21})
+
+    def test_queries_never_scan_raw_events(self):
+        """Test windowed totals come from the rollups, even after late events"""
+        ledger_ = SalesLedger(clock=self.clock, minute_retention=3600)
+        for minute in range(3 * 1440):
+            ledger_.record(ledger.PURCHASE, 1, "Chocolate", 1, timestamp=minute * 60.0)
+        ledger_.record(ledger.PURCHASE, 1, "Chocolate", 5, timestamp=DAY + 0.5)
+        ledger_.record(ledger.PURCHASE, 1, "Chocolate", 7, timestamp=3 * DAY - 30.0)
+
+        # Raw columns are not consulted: emptying them changes no answer
+        for column in ("_timestamps", "_kinds", "_sweet_ids", "_category_codes", "_quantities"):
+            del getattr(ledger_, column)[:]
+        self.assertEqual(ledger_.units_sold(DAY, 2 * DAY), {"Chocolate": 1440 + 5})
+        self.assertEqual(ledger_.units_sold(3 * DAY - 60, 3 * DAY), {"Chocolate": 1 + 7})
+
+    def test_late_events_are_counted(self):
+        """Test events older than the newest one land in closed buckets correctly"""
+        now = self.clock.now
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 3, timestamp=now - 60)
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 4, timestamp=now)
+        self.ledger.record(ledger.PURCHASE, 2, "Chocolate", 5, timestamp=now - 90)
+        self.ledger.record(ledger.PURCHASE, 1, "Chocolate", 6, timestamp=now - 3 * DAY)
+
+        self.assertEqual(self.ledger.units_sold(now - 120, now - 30, by="sweet"), {1: 3, 2: 5})
+        self.assertEqual(self.ledger.units_sold(now - 4 * DAY, by="sweet"), {1: 13, 2: 5})
+
+    def test_invalid_retention(self):
+        """Test a non-positive minute retention raises ValueError"""
+        with self.assertRaises(ValueError):
+            SalesLedger(minute_retention=0)
+
+    def test_cover_uses_coarse_buckets(self):
+        """Test a long window needs only a handful of buckets"""
+        pieces = list(_cover(30, 7 * 1440 + 90))
+
+        self.assertEqual(sum(g for g, _ in pieces), 7 * 1440 + 60)
+        self.assertLessEqual(len(pieces), 30 + 23 + 6 + 1 + 30)
+
+    def test_invalid_queries(self):
+        """Test bad grouping and reversed windows raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.ledger.units_sold(0, 10, by="price")
+        with self.assertRaises(ValueError):
+            self.ledger.units_sold(10, 0)
+
+class TestInventoryLedger(unittest.TestCase):
+    """Test cases for ledger entries written by Inventory"""
+
+    def setUp(self):
+        """Set up test inventory with a fake clock"""
+        self.clock = FakeClock(now=100 * DAY)
+        self.inventory = Inventory(clock=self.clock)
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50)
+        self.sweet2 = Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.inventory.add_sweet(self.sweet1)
+        self.inventory.add_sweet(self.sweet2)
+
+    def test_purchase_and_restock_recorded(self):
+        """Test purchases, restocks and committed reservations are logged"""
+        self.inventory.purchase_sweet(1, 5)
+        self.inventory.restock_sweet(2, 10)
+        reservation = self.inventory.reserve(2, 4, ttl=60)
+        self.inventory.commit_reservation(reservation.id)
+
+        week_ago = self.clock.now - 7 * DAY
+        self.assertEqual(self.inventory.ledger.units_sold(week_ago), {"Chocolate": 5, "Gummies": 4})
+        self.assertEqual(self.inventory.ledger.units_restocked(week_ago, by="sweet"), {2: 10})
+
+    def test_failed_purchase_not_recorded(self):
+        """Test rejected purchases leave no ledger entry"""
+        with self.assertRaises(ValueError):
+            self.inventory.purchase_sweet(1, 500)
+        self.assertEqual(len(self.inventory.ledger), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+from sweetshop.inventory import Inventory
+from sweetshop.locations import DEFAULT_LOCATION, StockTable
+from sweetshop.models import Sweet
+
+class TestStockTable(unittest.TestCase):
+    """Test cases for the StockTable per-location store"""
+
+    def setUp(self):
+        """Set up a table with stock in two locations"""
+        self.table = StockTable()
+        self.table.put(1, 10, "main")
+        self.table.put(1, 5, "store-2")
+
+    def test_put_and_quantity(self):
+        """Test stock is tracked per location"""
+        self.assertEqual(self.table.quantity(1, "main"), 10)
+        self.assertEqual(self.table.quantity(1, "store-2"), 5)
+        self.assertEqual(self.table.quantity(1, "warehouse"), 0)
+        self.assertEqual(self.table.in_stock_at("store-2"), {1})
+
+    def test_put_requires_location(self):
+        """Test None is rejected rather than stored as a location"""
+        with self.assertRaises(TypeError):
+            self.table.put(1, 5, None)
+        self.assertEqual(self.table.locations(1), {"main": 10, "store-2": 5})
+
+    def test_take_from_location(self):
+        """Test emptying a location removes it from the indexes"""
+        self.table.take(1, 5, "store-2")
+
+        self.assertEqual(self.table.locations(1), {"main": 10})
+        self.assertEqual(self.table.in_stock_at("store-2"), set())
+
+    def test_take_any_prefers_default(self):
+        """Test unlocated takes use the default location first"""
+        self.table.take(1, 12)
+
+        self.assertEqual(self.table.locations(1), {"store-2": 3})
+
+    def test_take_too_much(self):
+        """Test over-drawing leaves the table unchanged"""
+        with self.assertRaises(ValueError):
+            self.table.take(1, 6, "store-2")
+        with self.assertRaises(ValueError):
+            self.table.take(1, 16)
+
+        self.assertEqual(self.table.locations(1), {"main": 10, "store-2": 5})
+
+class TestInventoryLocations(unittest.TestCase):
+    """Test cases for location-aware Inventory operations"""
+
+    def setUp(self):
+        """Set up test inventory with stock spread over locations"""
+        self.inventory = Inventory()
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50)
+        self.sweet2 = Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.sweet3 = Sweet(id=3, name="Caramel Bar", category="Caramel", price=2.49, quantity=0)
+        for sweet in [self.sweet1, self.sweet2, self.sweet3]:
+            self.inventory.add_sweet(sweet)
+
+        self.inventory.restock_sweet(1, 20, location="store-2")
+        self.inventory.restock_sweet(3, 5, location="store-2")
+
+    def test_initial_stock_at_default_location(self):
+        """Test added quantity lands at the default location"""
+        self.assertEqual(self.inventory.stock_by_location(2), {DEFAULT_LOCATION: 100})
+
+    def test_total_is_running_sum(self):
+        """Test Sweet.quantity is the total across locations"""
+        self.assertEqual(self.sweet1.quantity, 70)
+        self.assertEqual(self.inventory.stock_by_location(1), {DEFAULT_LOCATION: 50, "store-2": 20})
+
+    def test_purchase_at_location(self):
+        """Test purchasing at a location only uses that location's stock"""
+        self.inventory.purchase_sweet(1, 15, location="store-2")
+        self.assertEqual(self.inventory.stock_by_location(1), {DEFAULT_LOCATION: 50, "store-2": 5})
+        self.assertEqual(self.sweet1.quantity, 55)
+
+        with self.assertRaises(ValueError) as context:
+            self.inventory.purchase_sweet(1, 6, location="store-2")
+        self.assertEqual(str(context.exception), "Not enough stock.")
+        self.assertEqual(self.sweet1.quantity, 55)
+
+    def test_purchase_without_location_uses_any(self):
+        """Test unlocated purchases still see the whole total"""
+        self.inventory.purchase_sweet(1, 60)
+
+        self.assertEqual(self.inventory.stock_by_location(1), {"store-2": 10})
+
+    def test_purchase_at_location_respects_holds(self):
+        """Test held stock is not sold at a location either"""
+        self.inventory.reserve(1, 60, ttl=60)
+
+        with self.assertRaises(ValueError):
+            self.inventory.purchase_sweet(1, 20, location="store-2")
+
+    def test_restock_without_location_uses_default(self):
+        """Test location=None restocks the default location, not a None location"""
+        self.inventory.restock_sweet(2, 5, location=None)
+
+        self.assertEqual(self.inventory.stock_by_location(2), {DEFAULT_LOCATION: 105})
+
+    def test_transfer(self):
+        """Test transfers move stock without changing the total"""
+        self.inventory.transfer_stock(2, 30, DEFAULT_LOCATION, "warehouse")
+
+        self.assertEqual(self.inventory.stock_by_location(2), {DEFAULT_LOCATION: 70, "warehouse": 30})
+        self.assertEqual(self.sweet2.quantity, 100)
+
+    def test_transfer_validation(self):
+        """Test bad transfers raise and change nothing"""
+        with self.assertRaises(ValueError):
+            self.inventory.transfer_stock(2, 0, DEFAULT_LOCATION, "warehouse")
+        with self.assertRaises(ValueError):
+            self.inventory.transfer_stock(2, 5, "warehouse", "warehouse")
+        with self.assertRaises(ValueError):
+            self.inventory.transfer_stock(2, 500, DEFAULT_LOCATION, "warehouse")
+        with self.assertRaises(KeyError):
+            self.inventory.transfer_stock(999, 5, DEFAULT_LOCATION, "warehouse")
+        with self.assertRaises(TypeError):
+            self.inventory.transfer_stock(2, 5, DEFAULT_LOCATION, None)
+        with self.assertRaises(TypeError):
+            self.inventory.transfer_stock(2, 5, None, "warehouse")
+
+        self.assertEqual(self.inventory.stock_by_location(2), {DEFAULT_LOCATION: 100})
+
+    def test_search_and_sort_by_location(self):
+        """Test search and sort can be limited to a location's stock"""
+        result = self.inventory.search_sweets(name="bar", location="store-2")
+        self.assertEqual(result, [self.sweet1, self.sweet3])
+
+        result = self.inventory.sort_sweets(key="price", location=DEFAULT_LOCATION)
+        self.assertEqual(result, [self.sweet2, self.sweet1])
+
+        self.assertEqual(self.inventory.search_sweets(location="nowhere"), [])
+
+    def test_delete_clears_locations(self):
+        """Test deleted sweets disappear from location filters"""
+        self.inventory.delete_sweet(3)
+
+        self.assertEqual(self.inventory.search_sweets(location="store-2"), [self.sweet1])
+        with self.assertRaises(KeyError):
+            self.inventory.stock_by_location(3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from sweetshop.inventory import Inventory
+from sweetshop.merkle import MerkleIndex
+from sweetshop.models import Sweet, SweetRecord
+
+def build_inventory(count):
+    """Create an inventory with count numbered sweets"""
+    inventory = Inventory()
+    for i in range(1, count + 1):
+        inventory.add_sweet(Sweet(id=i, name=f"Sweet {i}", category=f"Cat {i % 5}",
+                                  price=1.0 + i % 7, quantity=i % 50))
+    return inventory
+
+def renamed_record(sweet_id, name):
+    """Build the record of a numbered sweet with a new name"""
+    return SweetRecord(sweet_id, name, f"Cat {sweet_id % 5}", 1.0 + sweet_id % 7, sweet_id % 50)
+
+class TestMerkleIndex(unittest.TestCase):
+    """Test cases for the MerkleIndex hash tree"""
+
+    def test_root_independent_of_insert_order(self):
+        """Test equal contents give equal roots"""
+        first, second = MerkleIndex(), MerkleIndex()
+        for i in range(100):
+            first.update(i, i * 31 + 7)
+        for i in reversed(range(100)):
+            second.update(i, i * 31 + 7)
+
+        self.assertEqual(first.root_hash, second.root_hash)
+        self.assertEqual(first.diff(second), [])
+
+    def test_remove_restores_root(self):
+        """Test removing a sweet undoes its contribution"""
+        index = MerkleIndex()
+        index.update(1, 111)
+        root = index.root_hash
+        index.update(2, 222)
+        index.update(2, None)
+
+        self.assertEqual(index.root_hash, root)
+        self.assertEqual(len(index), 1)
+
+    def test_diff_finds_changes_additions_and_removals(self):
+        """Test diff reports every differing ID"""
+        first, second = MerkleIndex(), MerkleIndex()
+        for i in range(1000):
+            first.update(i, i + 1)
+            second.update(i, i + 1)
+        second.update(17, 999999)
+        second.update(5000, 1)
+        first.update(40000, 1)
+        second.update(3, None)
+
+        self.assertEqual(first.diff(second), [3, 17, 5000, 40000])
+        self.assertEqual(second.diff(first), [3, 17, 5000, 40000])
+
+    def test_large_and_negative_ids(self):
+        """Test IDs anywhere in the 64-bit range are handled"""
+        first, second = MerkleIndex(), MerkleIndex()
+        for sweet_id in (-5, 0, 2 ** 40, 2 ** 63 - 1):
+            first.update(sweet_id, 1)
+        second.update(2 ** 40, 1)
+
+        self.assertEqual(first.diff(second), [-5, 0, 2 ** 63 - 1])
+
+class TestInventoryReconciliation(unittest.TestCase):
+    """Test cases for Inventory diff/patch reconciliation"""
+
+    def setUp(self):
+        """Set up a store and a warehouse with identical contents"""
+        self.store = build_inventory(300)
+        self.warehouse = build_inventory(300)
+
+    def test_identical_inventories(self):
+        """Test identical inventories compare equal by root hash"""
+        self.assertEqual(self.store.merkle.root_hash, self.warehouse.merkle.root_hash)
+        self.assertEqual(self.store.diff(self.warehouse), [])
+
+    def test_every_mutation_updates_hash(self):
+        """Test purchases, restocks, price changes, adds and deletes are detected"""
+        self.warehouse.purchase_sweet(10, 1)
+        self.warehouse.restock_sweet(20, 5)
+        self.warehouse.update_price(30, 99.0)
+        self.warehouse.delete_sweet(40)
+        self.warehouse.add_sweet(Sweet(id=1000, name="New", category="Candy", price=1.0, quantity=1))
+
+        self.assertEqual(self.store.diff(self.warehouse), [10, 20, 30, 40, 1000])
+
+    def test_hash_returns_after_undo(self):
+        """Test reverting a change makes the inventories equal again"""
+        self.warehouse.purchase_sweet(10, 1)
+        self.warehouse.restock_sweet(10, 1)
+
+        self.assertEqual(self.store.diff(self.warehouse), [])
+
+    def test_make_patch(self):
+        """Test patches carry records for present and None for absent sweets"""
+        patch = self.store.make_patch([1, 999])
+
+        self.assertEqual(patch[1].name, "Sweet 1")
+        self.assertIsNone(patch[999])
+
+    def test_sync_from(self):
+        """Test syncing moves only the changed sweets and converges"""
+        self.warehouse.purchase_sweet(10, 1)
+        self.warehouse.update_price(30, 99.0)
+        self.warehouse.delete_sweet(40)
+        self.warehouse.add_sweet(Sweet(id=1000, name="New", category="Candy", price=1.0, quantity=1))
+        subscription = self.store.changes.subscribe()
+
+        changed = self.store.sync_from(self.warehouse)
+
+        self.assertEqual(changed, [10, 30, 40, 1000])
+        self.assertEqual(self.store.merkle.root_hash, self.warehouse.merkle.root_hash)
+        self.assertEqual(len(subscription.poll()), 4)
+        self.assertEqual(self.store.sync_from(self.warehouse), [])
+
+    def test_sync_lowering_stock_releases_newest_holds(self):
+        """Test holds that the synced quantity cannot cover are released, newest first"""
+        older = self.store.reserve(20, 2, ttl=60)
+        newer = self.store.reserve(20, 15, ttl=60)
+        self.warehouse.purchase_sweet(20, 17)
+
+        self.store.sync_from(self.warehouse)
+
+        self.assertEqual(self.store.available_quantity(20), 1)
+        with self.assertRaises(KeyError):
+            self.store.commit_reservation(newer.id)
+        self.store.commit_reservation(older.id)
+        self.assertEqual(self.store.stock_by_location(20), {"main": 1})
+
+    def test_int_and_float_prices_match(self):
+        """Test a price of 3 and 3.0 compare equal, so sync converges"""
+        self.store.update_price(7, 3)
+        self.warehouse.update_price(7, 3.0)
+
+        self.assertEqual(self.store.diff(self.warehouse), [])
+        self.assertEqual(self.store.sync_from(self.warehouse), [])
+
+    def test_sync_renamed_sweet(self):
+        """Test a name change is applied by replacing the sweet"""
+        self.warehouse.apply_patch({5: renamed_record(5, "Renamed")})
+        self.store.sync_from(self.warehouse)
+
+        self.assertEqual(self.store.autocomplete("renamed")[0].id, 5)
+        self.assertEqual(self.store.diff(self.warehouse), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+from sweetshop.query import Query
+from sweetshop.workload import CATEGORIES, generate_catalog
+
+class TestQuery(unittest.TestCase):
+    """Test cases for prepared Query objects"""
+
+    def setUp(self):
+        """Set up test inventory with sample sweets"""
+        self.inventory = Inventory()
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50)
+        self.sweet2 = Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.sweet3 = Sweet(id=3, name="Caramel Bar", category="Caramel", price=2.49, quantity=40)
+
+        for sweet in [self.sweet1, self.sweet2, self.sweet3]:
+            self.inventory.add_sweet(sweet)
+
+    def test_run_against_inventory(self):
+        """Test a query returns the same sweets as search_sweets()"""
+        query = Query(name="BAR", max_price=2.5)
+
+        self.assertEqual(query.run(self.inventory), [self.sweet3])
+        self.assertEqual(self.inventory.run_query(query), self.inventory.search_sweets(name="BAR", max_price=2.5))
+
+    def test_run_against_batch(self):
+        """Test a query filters a plain list and a snapshot"""
+        query = Query(min_price=2.0, max_price=3.0)
+
+        self.assertEqual(query.run([self.sweet1, self.sweet2]), [self.sweet1])
+        self.assertEqual([record.id for record in query.run(self.inventory.snapshot())], [1, 3])
+
+    def test_run_at_location(self):
+        """Test the location filter applies when running on an inventory"""
+        self.inventory.transfer_stock(2, 10, "main", "kiosk")
+
+        self.assertEqual(Query(name="bear").run(self.inventory, location="kiosk"), [self.sweet2])
+        self.assertEqual(Query(name="bar").run(self.inventory, location="kiosk"), [])
+
+    def test_query_is_reusable(self):
+        """Test one query sees later inventory changes on each run"""
+        query = Query(category="Chocolate")
+        self.assertEqual(len(query.run(self.inventory)), 1)
+
+        self.inventory.add_sweet(Sweet(id=4, name="Dark Truffle", category="Chocolate", price=3.5, quantity=5))
+        self.assertEqual(len(query.run(self.inventory)), 2)
+
+    def test_matches_and_iter(self):
+        """Test the single-sweet predicate and the lazy iterator"""
+        query = Query(category="Gummies")
+
+        self.assertTrue(query.matches(self.sweet2))
+        self.assertFalse(query.matches(self.sweet1))
+        self.assertEqual(list(query.iter(iter(self.inventory.sweets))), [self.sweet2])
+
+    def test_empty_query_matches_everything(self):
+        """Test no filters, or an empty name, match every sweet"""
+        self.assertEqual(Query().run(self.inventory), self.inventory.sweets)
+        self.assertEqual(Query(name="").run(self.inventory), self.inventory.sweets)
+
+    def test_matches_search_for_every_filter_combination(self):
+        """Test compiled queries agree with the filter semantics on random data"""
+        catalog = generate_catalog(300, seed=11)
+        rng = random.Random(12)
+        for _ in range(200):
+            name = rng.choice([None, "", "ka", "JAMUN", "a", "zzz"])
+            category = rng.choice([None, "Fried", *CATEGORIES])
+            min_price = rng.choice([None, 5.0, 20.0])
+            max_price = rng.choice([None, 25.0, 60.0])
+            if min_price is not None and max_price is not None and min_price > max_price:
+                continue
+
+            expected = [
+                s for s in catalog
+                if (name is None or name.lower() in s.name.lower())
+                and (category is None or s.category == category)
+                and (min_price is None or s.price >= min_price)
+                and (max_price is None or s.price <= max_price)
+            ]
+            self.assertEqual(Query(name, category, min_price, max_price).select(catalog), expected)
+
+    def test_invalid_price_range(self):
+        """Test min_price > max_price raises ValueError when preparing"""
+        with self.assertRaises(ValueError):
+            Query(min_price=5, max_price=1)
+
+    def test_repr_lists_active_filters(self):
+        """Test the repr shows only the filters that were given"""
+        self.assertEqual(repr(Query(name="bar", min_price=1.0)), "Query(name='bar', min_price=1.0)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+from sweetshop.reservations import TimingWheel
+from fakes import FakeClock
+
+class TestTimingWheel(unittest.TestCase):
+    """Test cases for the TimingWheel expiry structure"""
+
+    def test_advance_returns_due_keys(self):
+        """Test that only keys whose deadline has passed are expired"""
+        wheel = TimingWheel(tick=1.0, slots=8)
+        wheel.schedule("a", 2.5)
+        wheel.schedule("b", 5.0)
+
+        self.assertEqual(wheel.advance(2.0), [])
+        self.assertEqual(wheel.advance(3.0), ["a"])
+        self.assertEqual(wheel.advance(5.0), ["b"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_deadline_within_current_tick(self):
+        """Test a key due later in the current tick is not lost"""
+        wheel = TimingWheel(tick=10.0, slots=4)
+        wheel.schedule("a", 7.0)
+
+        self.assertEqual(wheel.advance(5.0), [])
+        self.assertEqual(wheel.advance(7.0), ["a"])
+
+    def test_deadline_beyond_one_rotation(self):
+        """Test keys more than one lap ahead wait for their own lap"""
+        wheel = TimingWheel(tick=1.0, slots=4)
+        wheel.schedule("far", 9.5)
+
+        self.assertEqual(wheel.advance(2.0), [])
+        self.assertEqual(wheel.advance(6.0), [])
+        self.assertEqual(wheel.advance(9.5), ["far"])
+
+    def test_large_jump_expires_everything_due(self):
+        """Test advancing past several laps at once"""
+        wheel = TimingWheel(tick=1.0, slots=4)
+        for i in range(10):
+            wheel.schedule(i, float(i))
+
+        self.assertCountEqual(wheel.advance(100.0), list(range(10)))
+
+    def test_cancel(self):
+        """Test cancelled keys never expire"""
+        wheel = TimingWheel(tick=1.0, slots=8)
+        wheel.schedule("a", 1.0)
+
+        self.assertTrue(wheel.cancel("a"))
+        self.assertFalse(wheel.cancel("a"))
+        self.assertEqual(wheel.advance(10.0), [])
+
+class TestInventoryReservations(unittest.TestCase):
+    """Test cases for Inventory reservation methods"""
+
+    def setUp(self):
+        """Set up test inventory with a fake clock"""
+        self.clock = FakeClock()
+        self.inventory = Inventory(clock=self.clock)
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50)
+        self.inventory.add_sweet(self.sweet1)
+
+    def test_reserve_reduces_available_not_on_hand(self):
+        """Test a hold is reported as on-hand minus held"""
+        self.inventory.reserve(1, 20, ttl=60)
+
+        self.assertEqual(self.sweet1.quantity, 50)
+        self.assertEqual(self.inventory.available_quantity(1), 30)
+
+    def test_purchase_cannot_take_held_stock(self):
+        """Test purchase_sweet only sells unreserved stock"""
+        self.inventory.reserve(1, 40, ttl=60)
+
+        with self.assertRaises(ValueError) as context:
+            self.inventory.purchase_sweet(1, 20)
+        self.assertEqual(str(context.exception), "Not enough stock.")
+
+        self.inventory.purchase_sweet(1, 10)
+        self.assertEqual(self.inventory.available_quantity(1), 0)
+
+    def test_reserve_insufficient_stock(self):
+        """Test reserving more than is available raises ValueError"""
+        self.inventory.reserve(1, 30, ttl=60)
+
+        with self.assertRaises(ValueError) as context:
+            self.inventory.reserve(1, 30, ttl=60)
+        self.assertEqual(str(context.exception), "Not enough stock.")
+
+    def test_reserve_invalid_arguments(self):
+        """Test invalid quantity, ttl and ID"""
+        with self.assertRaises(ValueError):
+            self.inventory.reserve(1, 0, ttl=60)
+        with self.assertRaises(ValueError):
+            self.inventory.reserve(1, 5, ttl=0)
+        with self.assertRaises(KeyError):
+            self.inventory.reserve(999, 5, ttl=60)
+
+    def test_commit_becomes_purchase(self):
+        """Test committing a reservation reduces on-hand stock"""
+        reservation = self.inventory.reserve(1, 20, ttl=60)
+        self.inventory.commit_reservation(reservation.id)
+
+        self.assertEqual(self.sweet1.quantity, 30)
+        self.assertEqual(self.inventory.available_quantity(1), 30)
+
+    def test_commit_without_stock_keeps_hold(self):
+        """Test a commit that cannot be covered fails before the hold is removed"""
+        reservation = self.inventory.reserve(1, 20, ttl=60)
+        self.inventory._set_quantity(self.sweet1, 10)
+
+        with self.assertRaises(ValueError):
+            self.inventory.commit_reservation(reservation.id)
+        self.assertIn(reservation.id, self.inventory._reservations)
+        self.assertEqual(self.sweet1.quantity, 10)
+
+    def test_release_returns_stock(self):
+        """Test releasing a reservation frees the held stock"""
+        reservation = self.inventory.reserve(1, 20, ttl=60)
+        self.inventory.release_reservation(reservation.id)
+
+        self.assertEqual(self.sweet1.quantity, 50)
+        self.assertEqual(self.inventory.available_quantity(1), 50)
+
+    def test_reservation_can_only_finish_once(self):
+        """Test a committed reservation cannot be committed or released again"""
+        reservation = self.inventory.reserve(1, 20, ttl=60)
+        self.inventory.commit_reservation(reservation.id)
+
+        with self.assertRaises(KeyError):
+            self.inventory.commit_reservation(reservation.id)
+        with self.assertRaises(KeyError):
+            self.inventory.release_reservation(reservation.id)
+
+    def test_reservation_expires_after_ttl(self):
+        """Test an abandoned hold lapses and its stock becomes available"""
+        reservation = self.inventory.reserve(1, 20, ttl=60)
+
+        self.clock.advance(59)
+        self.assertEqual(self.inventory.available_quantity(1), 30)
+
+        self.clock.advance(1)
+        self.assertEqual(self.inventory.available_quantity(1), 50)
+
+        with self.assertRaises(KeyError) as context:
+            self.inventory.commit_reservation(reservation.id)
+        self.assertEqual(str(context.exception), "'Reservation not found.'")
+
+    def test_expired_hold_allows_purchase(self):
+        """Test purchase succeeds once competing holds have expired"""
+        self.inventory.reserve(1, 50, ttl=30)
+        self.clock.advance(3600)
+
+        self.inventory.purchase_sweet(1, 50)
+        self.assertEqual(self.sweet1.quantity, 0)
+
+    def test_delete_sweet_drops_holds(self):
+        """Test deleting a sweet discards its reservations"""
+        reservation = self.inventory.reserve(1, 20, ttl=60)
+        self.inventory.delete_sweet(1)
+
+        with self.assertRaises(KeyError):
+            self.inventory.commit_reservation(reservation.id)
+
+    def test_many_holds_expire(self):
+        """Test a large number of holds with staggered TTLs all expire"""
+        self.inventory.restock_sweet(1, 9000 - 50)
+        for i in range(9000):
+            self.inventory.reserve(1, 1, ttl=1 + i % 900)
+        self.assertEqual(self.inventory.available_quantity(1), 0)
+
+        self.clock.advance(450)
+        self.assertEqual(self.inventory.available_quantity(1), 4500)
+
+        self.clock.advance(10000)
+        self.assertEqual(self.inventory.available_quantity(1), 9000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import threading
+import unittest
+from sweetshop.inventory import Inventory
+from sweetshop.models import Sweet
+
+class TestInventorySnapshot(unittest.TestCase):
+    """Test cases for Inventory.snapshot() MVCC reads"""
+
+    def setUp(self):
+        """Set up test inventory with sample sweets"""
+        self.inventory = Inventory()
+        self.sweet1 = Sweet(id=1, name="Chocolate Bar", category="Chocolate", price=2.99, quantity=50)
+        self.sweet2 = Sweet(id=2, name="Gummy Bears", category="Gummies", price=1.99, quantity=100)
+        self.sweet3 = Sweet(id=3, name="Caramel Bar", category="Caramel", price=2.49, quantity=40)
+
+        for sweet in [self.sweet1, self.sweet2, self.sweet3]:
+            self.inventory.add_sweet(sweet)
+
+    def test_snapshot_shares_sweet_list(self):
+        """Test taking a snapshot does not copy the inventory"""
+        sweets = self.inventory.sweets
+        snapshot = self.inventory.snapshot()
+
+        self.assertIs(snapshot._sweets, sweets)
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot.seq, self.inventory.changes.last_seq)
+
+    def test_snapshot_ignores_later_quantity_changes(self):
+        """Test purchases after the snapshot are invisible to it"""
+        snapshot = self.inventory.snapshot()
+        self.inventory.purchase_sweet(1, 10)
+        self.inventory.purchase_sweet(1, 5)
+        self.inventory.restock_sweet(2, 7)
+
+        quantities = {r.id: r.quantity for r in snapshot}
+        self.assertEqual(quantities, {1: 50, 2: 100, 3: 40})
+        self.assertEqual(self.sweet1.quantity, 35)
+
+    def test_snapshot_ignores_later_price_changes(self):
+        """Test repricing after the snapshot is invisible to it"""
+        snapshot = self.inventory.snapshot()
+        self.inventory.update_price(3, 9.99)
+
+        self.assertEqual(snapshot.search_sweets(min_price=5.00), [])
+        self.assertEqual(len(self.inventory.search_sweets(min_price=5.00)), 1)
+
+    def test_snapshot_ignores_adds_and_deletes(self):
+        """Test structural changes do not affect an existing snapshot"""
+        snapshot = self.inventory.snapshot()
+        self.inventory.delete_sweet(2)
+        self.inventory.add_sweet(Sweet(id=4, name="Lollipop", category="Hard Candy", price=0.99, quantity=75))
+
+        self.assertEqual([r.id for r in snapshot], [1, 2, 3])
+        self.assertEqual([s.id for s in self.inventory.view_all_sweets()], [1, 3, 4])
+
+    def test_multiple_snapshots_see_their_own_versions(self):
+        """Test each snapshot sees the state at the time it was taken"""
+        first = self.inventory.snapshot()
+        self.inventory.purchase_sweet(1, 10)
+        second = self.inventory.snapshot()
+        self.inventory.purchase_sweet(1, 10)
+        third = self.inventory.snapshot()
+
+        self.assertEqual(first.view_all_sweets()[0].quantity, 50)
+        self.assertEqual(second.view_all_sweets()[0].quantity, 40)
+        self.assertEqual(third.view_all_sweets()[0].quantity, 30)
+
+    def test_change_during_iteration(self):
+        """Test a write halfway through a read does not leak into it"""
+        snapshot = self.inventory.snapshot()
+        rows = iter(snapshot)
+        first = next(rows)
+        self.inventory.purchase_sweet(2, 60)
+        self.inventory.purchase_sweet(3, 40)
+
+        self.assertEqual(first.quantity, 50)
+        self.assertEqual([r.quantity for r in rows], [100, 40])
+
+    def test_snapshot_search_and_sort(self):
+        """Test search and sort run against the snapshot"""
+        snapshot = self.inventory.snapshot()
+        self.inventory.delete_sweet(3)
+
+        self.assertEqual([r.id for r in snapshot.search_sweets(name="bar")], [1, 3])
+        self.assertEqual([r.id for r in snapshot.sort_sweets(key="price")], [2, 3, 1])
+        with self.assertRaises(ValueError):
+            snapshot.sort_sweets(key="quantity")
+        with self.assertRaises(ValueError):
+            snapshot.search_sweets(min_price=5, max_price=1)
+
+    def test_snapshot_is_read_only(self):
+        """Test snapshot rows cannot be modified"""
+        record = self.inventory.snapshot().view_all_sweets()[0]
+
+        with self.assertRaises(AttributeError):
+            record.quantity = 0
+
+    def test_history_released_with_snapshots(self):
+        """Test version history is dropped once no snapshot is alive"""
+        snapshot = self.inventory.snapshot()
+        self.inventory.purchase_sweet(1, 1)
+        self.assertTrue(self.inventory._history)
+
+        del snapshot
+        self.inventory.purchase_sweet(1, 1)
+        self.assertFalse(self.inventory._history)
+
+    def test_history_pruned_while_old_snapshot_lives(self):
+        """Test versions only dropped snapshots needed are not kept forever"""
+        for i in range(4, 100):
+            self.inventory.add_sweet(Sweet(id=i, name=f"Sweet {i}", category="Candy", price=1.0, quantity=10))
+        kept = self.inventory.snapshot()
+        newest = None
+        for _ in range(200):
+            newest = self.inventory.snapshot()
+            for sweet_id in range(1, 100):
+                self.inventory.restock_sweet(sweet_id, 1)
+
+        entries = sum(len(versions) for versions in self.inventory._history.values())
+        self.assertLess(entries, 2000)
+        self.assertEqual([r.quantity for r in kept][:4], [50, 100, 40, 10])
+        self.assertEqual([r.quantity for r in newest][:4], [249, 299, 239, 209])
+
+    def test_consistent_totals_under_concurrent_writes(self):
+        """Test a report sees a consistent total while transfers run"""
+        # Move stock from sweet 1 to sweet 2 one unit at a time; any
+        # consistent view must see the same total of the two quantities,
+        # counting the unit in flight between the paired writes.
+        stop = threading.Event()
+
+        def writer():
+            while not stop.is_set():
+                if self.sweet1.quantity == 0:
+                    break
+                self.inventory.purchase_sweet(1, 1)
+                self.inventory.restock_sweet(2, 1)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(200):
+                snapshot = self.inventory.snapshot()
+                first = sum(r.quantity for r in snapshot)
+                second = sum(r.quantity for r in snapshot)
+                self.assertEqual(first, second)
+                self.assertIn(first, (189, 190))
+        finally:
+            stop.set()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import random
+import unittest
+from sweetshop import workload
+from sweetshop.inventory import Inventory
+from sweetshop.workload import ZipfSampler, generate_catalog, generate_operations, replay
+
+class TestGenerateCatalog(unittest.TestCase):
+    """Test cases for workload.generate_catalog()"""
+
+    def test_catalog_is_reproducible(self):
+        """Test the same seed produces the same catalog"""
+        first = generate_catalog(50, seed=7)
+        second = generate_catalog(50, seed=7)
+
+        self.assertEqual([(s.id, s.name, s.price) for s in first],
+                         [(s.id, s.name, s.price) for s in second])
+
+    def test_catalog_shape(self):
+        """Test IDs, categories and prices look like the sample data"""
+        catalog = generate_catalog(500, seed=1, first_id=1001)
+
+        self.assertEqual([s.id for s in catalog], list(range(1001, 1501)))
+        self.assertTrue({s.category for s in catalog} <= set(workload.CATEGORIES))
+        self.assertTrue(all(1.0 <= s.price <= 500.0 for s in catalog))
+        median = sorted(s.price for s in catalog)[250]
+        self.assertTrue(10 <= median <= 50)
+
+class TestGenerateOperations(unittest.TestCase):
+    """Test cases for workload.generate_operations()"""
+
+    def setUp(self):
+        """Set up a small catalog"""
+        self.catalog = generate_catalog(200, seed=3)
+
+    def test_operations_are_reproducible(self):
+        """Test the same seed produces the same stream"""
+        first = generate_operations(self.catalog, 300, seed=9)
+        second = generate_operations(self.catalog, 300, seed=9)
+
+        self.assertEqual(first, second)
+
+    def test_mix_is_respected(self):
+        """Test only the requested kinds appear, in rough proportion"""
+        operations = generate_operations(self.catalog, 2000, mix={"purchase": 3, "search": 1}, seed=1)
+        purchases = sum(op.kind == "purchase" for op in operations)
+
+        self.assertEqual({op.kind for op in operations}, {"purchase", "search"})
+        self.assertTrue(1350 <= purchases <= 1650)
+
+    def test_popularity_is_skewed(self):
+        """Test the most popular sweet gets far more traffic than the median"""
+        operations = generate_operations(self.catalog, 5000, mix={"purchase": 1}, skew=1.2, seed=2)
+        hits = {}
+        for op in operations:
+            hits[op.args["sweet_id"]] = hits.get(op.args["sweet_id"], 0) + 1
+
+        self.assertGreater(hits[self.catalog[0].id], 10 * hits.get(self.catalog[100].id, 1))
+
+    def test_adds_use_new_ids_and_deletes_are_unique(self):
+        """Test adds never collide and each sweet is deleted at most once"""
+        operations = generate_operations(self.catalog, 1000, mix={"add": 1, "delete": 1}, seed=4)
+        added = [op.args["id"] for op in operations if op.kind == "add"]
+        deleted = [op.args["sweet_id"] for op in operations if op.kind == "delete"]
+
+        self.assertTrue(min(added) > 200)
+        self.assertEqual(len(deleted), len(set(deleted)))
+
+    def test_invalid_arguments(self):
+        """Test empty catalogs and unknown kinds raise ValueError"""
+        with self.assertRaises(ValueError):
+            generate_operations([], 10)
+        with self.assertRaises(ValueError):
+            generate_operations(self.catalog, 10, mix={"teleport": 1})
+
+class TestZipfSampler(unittest.TestCase):
+    """Test cases for workload.ZipfSampler"""
+
+    def test_ranks_in_range(self):
+        """Test samples stay within 0..n-1"""
+        sampler = ZipfSampler(10, 1.0, random.Random(0))
+        samples = [sampler.sample() for _ in range(1000)]
+
+        self.assertTrue(all(0 <= rank < 10 for rank in samples))
+        self.assertGreater(samples.count(0), samples.count(9))
+
+class TestReplay(unittest.TestCase):
+    """Test cases for workload.replay()"""
+
+    def setUp(self):
+        """Set up an inventory loaded with a synthetic catalog"""
+        self.catalog = generate_catalog(100, seed=5)
+        self.operations = generate_operations(self.catalog, 500, seed=6)
+
+    def load_inventory(self):
+        """Create an inventory holding a fresh copy of the catalog"""
+        inventory = Inventory()
+        for sweet in generate_catalog(100, seed=5):
+            inventory.add_sweet(sweet)
+        return inventory
+
+    def test_report_counts_every_operation(self):
+        """Test the report covers each operation kind"""
+        report = replay(self.load_inventory(), self.operations)
+
+        self.assertEqual(report.operations, 500)
+        for kind, stats in report.stats.items():
+            self.assertEqual(stats.count, sum(op.kind == kind for op in self.operations))
+            self.assertLessEqual(stats.p50, stats.p99)
+            self.assertLessEqual(stats.p99, stats.max)
+        self.assertGreater(report.throughput, 0)
+        self.assertIn("purchase", report.format())
+
+    def test_single_thread_replay_is_deterministic(self):
+        """Test replaying the same stream twice ends in the same state"""
+        first, second = self.load_inventory(), self.load_inventory()
+        replay(first, self.operations)
+        replay(second, self.operations)
+
+        self.assertEqual(first.merkle.root_hash, second.merkle.root_hash)
+
+    def test_multi_threaded_replay(self):
+        """Test operations are shared out across threads"""
+        report = replay(self.load_inventory(), self.operations, threads=4)
+
+        self.assertEqual(report.threads, 4)
+        self.assertEqual(report.operations, 500)
+
+    def test_invalid_thread_count(self):
+        """Test a non-positive thread count raises ValueError"""
+        with self.assertRaises(ValueError):
+            replay(self.load_inventory(), self.operations, threads=0)
+
+
+if __name__ == '__main__':
+    unittest.main()